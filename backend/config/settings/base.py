@@ -5,6 +5,7 @@ Common settings shared across all environments.
 
 import os
 from pathlib import Path
+from types import MappingProxyType
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -87,7 +88,13 @@ DATABASES = {
         'PASSWORD': os.environ.get('POSTGRES_PASSWORD', 'tickets_password'),
         'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
         'PORT': os.environ.get('POSTGRES_PORT', '5432'),
-        'CONN_MAX_AGE': 60,  # Persistent connections for 60s
+        # Keep connections for the worker's lifetime instead of reconnecting
+        # (TCP + TLS + auth) every 60s; Gunicorn's max_requests recycling
+        # refreshes them. Health checks drop connections the server closed.
+        # Behind pgbouncer (transaction pooling), keep this and also set
+        # DISABLE_SERVER_SIDE_CURSORS = True.
+        'CONN_MAX_AGE': None,
+        'CONN_HEALTH_CHECKS': True,
         'OPTIONS': {
             'connect_timeout': 10,
             # Add sslmode only when explicitly set (e.g. 'require' for Supabase)
@@ -110,7 +117,12 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'tickets.renderers.ORJSONRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'tickets.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'EXCEPTION_HANDLER': 'tickets.exceptions.custom_exception_handler',
 }
@@ -208,8 +220,59 @@ LOGGING = {
 }
 
 
+# =============================================================================
+# CACHE
+# =============================================================================
+# Per-process memory cache by default. Set REDIS_URL to share one cache
+# across Gunicorn workers — then a ticket write invalidates cached /stats/
+# for every worker, not just the one that handled the write.
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'tickets-backend-cache',
+        }
+    }
+
+# Seconds a computed /stats/ response may be served from cache. With the
+# per-process cache this also bounds how stale another worker's copy can be.
+STATS_CACHE_TIMEOUT = int(os.environ.get('STATS_CACHE_TIMEOUT', 5))
+
+# Seconds a list endpoint COUNT(*) (per filter combination) may be reused.
+# Ticket writes invalidate it immediately; the timeout bounds staleness from
+# writes made through another worker's per-process cache.
+LIST_COUNT_CACHE_TIMEOUT = int(os.environ.get('LIST_COUNT_CACHE_TIMEOUT', 5))
+
+# Seconds a Gemini classification is shared across workers via Redis. Only
+# used with REDIS_URL — without it each worker's in-process result cache
+# (tickets.services.llm_service) is the only tier.
+CLASSIFY_CACHE_TIMEOUT = int(os.environ.get('CLASSIFY_CACHE_TIMEOUT', 3600))
+
+
 # =============================================================================
 # LLM CONFIGURATION
 # =============================================================================
 
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY', '')
+
+
+# =============================================================================
+# FREEZE STRUCTURED SETTINGS
+# =============================================================================
+# The top-level mappings are exposed read-only so nothing can rewrite them at
+# runtime (a mutated REST_FRAMEWORK or DATABASES would silently diverge from
+# what DRF / the connection handler cached at start-up). Environment
+# modules that need different values assign a new mapping instead of
+# mutating these.
+
+DATABASES = MappingProxyType(DATABASES)
+REST_FRAMEWORK = MappingProxyType(REST_FRAMEWORK)
+LOGGING = MappingProxyType(LOGGING)
@@ -19,6 +19,7 @@ How to run with Docker (full stack):
 """
 
 import os
+from types import MappingProxyType
 
 from .base import *  # noqa: F401, F403
 
@@ -30,10 +31,13 @@ ALLOWED_HOSTS = ['*']
 CORS_ALLOW_ALL_ORIGINS = True
 
 # Enable the DRF browsable API UI in development
-REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [  # noqa: F405
-    'rest_framework.renderers.JSONRenderer',
-    'rest_framework.renderers.BrowsableAPIRenderer',
-]
+REST_FRAMEWORK = MappingProxyType({  # noqa: F405
+    **REST_FRAMEWORK,  # noqa: F405
+    'DEFAULT_RENDERER_CLASSES': [
+        'tickets.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+})
 
 # ---------------------------------------------------------------------------
 # SQLite fallback for local dev without any running database
@@ -46,9 +50,21 @@ REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [  # noqa: F405
 #   export POSTGRES_DB=your_db  (plus other POSTGRES_* vars)
 # ---------------------------------------------------------------------------
 if not os.environ.get('POSTGRES_DB'):
-    DATABASES = {  # noqa: F811
+    DATABASES = MappingProxyType({  # noqa: F811
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',  # noqa: F405
+            # WAL lets readers run alongside a writer; synchronous=NORMAL
+            # is crash-safe under WAL and skips an fsync per commit. Temp
+            # tables/sorts stay in memory, 256MB mmap, ~64MB page cache.
+            'OPTIONS': {
+                'init_command': (
+                    'PRAGMA journal_mode=WAL;'
+                    'PRAGMA synchronous=NORMAL;'
+                    'PRAGMA temp_store=MEMORY;'
+                    'PRAGMA mmap_size=268435456;'
+                    'PRAGMA cache_size=-64000;'
+                ),
+            },
         }
-    }
+    })
@@ -1,10 +1,12 @@
 """
 Django production settings.
 DEBUG=False, strict CORS, secure defaults.
+API-only by default — set DJANGO_ADMIN_ENABLED=1 to keep the Django admin.
 """
 
 from .base import *  # noqa: F401, F403
 import os
+from types import MappingProxyType
 
 DEBUG = False
 
@@ -20,3 +22,46 @@ SECURE_CONTENT_TYPE_NOSNIFF = True
 X_FRAME_OPTIONS = 'DENY'
 CSRF_COOKIE_SECURE = True
 SESSION_COOKIE_SECURE = True
+
+# =============================================================================
+# API-ONLY MODE
+# =============================================================================
+# The frontend talks to the JSON API only. Unless the Django admin is wanted
+# (DJANGO_ADMIN_ENABLED=1), drop the apps, middleware and context processors
+# that exist only to serve it — every request otherwise pays for a session
+# lookup, CSRF check, lazy user object and message storage it never uses.
+
+ADMIN_ENABLED = os.environ.get('DJANGO_ADMIN_ENABLED', '0') == '1'
+
+if not ADMIN_ENABLED:
+    _ADMIN_ONLY_APPS = {
+        'django.contrib.admin',
+        'django.contrib.sessions',
+        'django.contrib.messages',
+    }
+    _ADMIN_ONLY_MIDDLEWARE = {
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+    }
+
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in _ADMIN_ONLY_APPS]
+    MIDDLEWARE = [mw for mw in MIDDLEWARE if mw not in _ADMIN_ONLY_MIDDLEWARE]
+    TEMPLATES = [
+        {
+            **TEMPLATES[0],
+            'OPTIONS': {
+                **TEMPLATES[0]['OPTIONS'],
+                'context_processors': [
+                    'django.template.context_processors.request',
+                ],
+            },
+        },
+    ]
+    # No sessions and no users — skip DRF's per-request auth pass as well
+    REST_FRAMEWORK = MappingProxyType({
+        **REST_FRAMEWORK,
+        'DEFAULT_AUTHENTICATION_CLASSES': [],
+        'UNAUTHENTICATED_USER': None,
+    })
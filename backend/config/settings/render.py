@@ -41,7 +41,8 @@ DATABASES = {
         'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
         'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
         'PORT': os.environ.get('POSTGRES_PORT', '5432'),
-        'CONN_MAX_AGE': 600,  # Connection pooling
+        'CONN_MAX_AGE': None,  # Persistent for the worker lifetime (see base.py)
+        'CONN_HEALTH_CHECKS': True,
         'OPTIONS': {
             'connect_timeout': 10,
             'options': '-c default_transaction_isolation=read_committed'
@@ -55,7 +56,7 @@ if DATABASE_URL:
     import dj_database_url
     DATABASES['default'] = dj_database_url.config(
         default=DATABASE_URL,
-        conn_max_age=600,
+        conn_max_age=None,
         conn_health_checks=True,
     )
 
@@ -119,14 +120,8 @@ LOGGING = {
 # PERFORMANCE & CACHE
 # =============================================================================
 
-# Simple in-memory cache for development
-# Upgrade to Redis in production if needed
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'tickets-backend-cache',
-    }
-}
+# CACHES comes from base — in-memory per worker, or Redis when REDIS_URL
+# is set (recommended here: Render runs several workers per instance)
 
 # =============================================================================
 # GUNICORN
@@ -2,14 +2,19 @@
 URL configuration for the Support Ticket System.
 
 Routes:
-    /admin/          — Django admin
+    /admin/          — Django admin (only when django.contrib.admin is installed)
     /api/tickets/    — Ticket CRUD, stats, and classification
 """
 
-from django.contrib import admin
+from django.apps import apps
 from django.urls import include, path
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('api/tickets/', include('tickets.urls')),
 ]
+
+# Production runs API-only unless DJANGO_ADMIN_ENABLED=1 (see settings/production.py)
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
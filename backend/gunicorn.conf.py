@@ -6,6 +6,7 @@ Features:
     - Graceful shutdown with 30s timeout
     - Worker recycling to prevent memory leaks
     - Lifecycle logging hooks
+    - Gemini SDK imported once in the master before fork
 """
 
 import multiprocessing
@@ -23,8 +24,14 @@ backlog = 2048
 # =============================================================================
 
 workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
-worker_class = 'gthread'    # Thread-based workers — ideal for I/O (LLM API calls)
-threads = 4                 # Threads per worker
+# gthread rather than gevent: the Gemini SDK talks gRPC, which does not
+# yield to gevent's loop without extra patching, and Django's persistent DB
+# connections (CONN_MAX_AGE=None) are per-thread — one per greenlet would not
+# be bounded. Threads release the GIL while waiting on the LLM, so raise
+# GUNICORN_THREADS for more in-flight classifications per worker (each
+# thread also holds one DB connection).
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
 worker_connections = 1000
 
 # =============================================================================
@@ -66,6 +73,15 @@ def on_starting(server):
     server.log.info('Gunicorn master starting — PID %s', server.pid)
 
 
+def when_ready(server):
+    """Called in the master once the app is loaded, just before workers fork."""
+    if server.cfg.preload_app:
+        # Import the Gemini SDK once here; workers share it copy-on-write
+        from tickets.services.llm_service import warm_up
+        warm_up()
+    server.log.info('Gunicorn master ready — forking %s workers', server.num_workers)
+
+
 def on_reload(server):
     """Called to recycle workers during a reload."""
     server.log.info('Gunicorn master reloading')
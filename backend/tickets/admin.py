@@ -13,3 +13,5 @@ class TicketAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at',)
     ordering = ('-created_at',)
     list_per_page = 25
+    # Skip the extra unfiltered COUNT(*) the changelist runs for "N total"
+    show_full_result_count = False
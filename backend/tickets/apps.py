@@ -1,5 +1,27 @@
 from django.apps import AppConfig
+from django.conf import settings
+
+# Cache backends private to one process — sharing LLM answers through them
+# would only duplicate LLMService's in-memory tier
+_PER_PROCESS_CACHES = frozenset({
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+})
 
 
 class TicketsConfig(AppConfig):
     name = 'tickets'
+
+    def ready(self):
+        from . import signals  # noqa: F401 — registers the receivers
+
+        if settings.CACHES['default']['BACKEND'] not in _PER_PROCESS_CACHES:
+            # Share Gemini answers across workers; with a per-process default
+            # cache the service's own in-memory tier is enough.
+            # `cache`/`caches[...]` hand each thread its own backend (and so
+            # its own Redis pool); one standalone instance lets classify_batch
+            # workers share a single connection pool per process.
+            from django.core.cache import caches
+
+            from .services.llm_service import set_shared_cache
+            set_shared_cache(caches.create_connection('default'), settings.CLASSIFY_CACHE_TIMEOUT)
@@ -11,6 +11,19 @@ from rest_framework.views import exception_handler
 
 logger = logging.getLogger('tickets')
 
+# HTTP status code → error title used in the envelope
+_ERROR_TITLES = {
+    400: 'Bad Request',
+    401: 'Unauthorized',
+    403: 'Forbidden',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    409: 'Conflict',
+    415: 'Unsupported Media Type',
+    429: 'Too Many Requests',
+    500: 'Internal Server Error',
+}
+
 
 def custom_exception_handler(exc, context):
     """
@@ -22,7 +35,7 @@ def custom_exception_handler(exc, context):
     if response is not None:
         # Build a consistent error envelope
         error_data = {
-            'error': _get_error_title(response.status_code),
+            'error': get_error_title(response.status_code),
             'details': response.data,
         }
         response.data = error_data
@@ -38,16 +51,6 @@ def custom_exception_handler(exc, context):
     return response
 
 
-def _get_error_title(status_code: int) -> str:
+def get_error_title(status_code: int) -> str:
     """Map HTTP status codes to human-readable error titles."""
-    titles = {
-        400: 'Bad Request',
-        401: 'Unauthorized',
-        403: 'Forbidden',
-        404: 'Not Found',
-        405: 'Method Not Allowed',
-        409: 'Conflict',
-        429: 'Too Many Requests',
-        500: 'Internal Server Error',
-    }
-    return titles.get(status_code, f'Error {status_code}')
+    return _ERROR_TITLES.get(status_code, f'Error {status_code}')
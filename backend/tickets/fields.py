@@ -0,0 +1,32 @@
+"""
+Custom model fields for the tickets app.
+
+PgEnumField — CharField stored as a native PostgreSQL ENUM type
+"""
+
+from django.db import models
+
+
+class PgEnumField(models.CharField):
+    """
+    A CharField whose column is a PostgreSQL ENUM type on PostgreSQL.
+
+    Enum values are stored in 4 bytes instead of a varchar, which keeps the
+    tickets rows and their indexes narrow. The type itself (`enum_type`)
+    must already exist — it is created by a migration. Other backends
+    (the SQLite development fallback) keep a plain varchar column.
+    """
+
+    def __init__(self, *args, enum_type, **kwargs):
+        self.enum_type = enum_type
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['enum_type'] = self.enum_type
+        return name, path, args, kwargs
+
+    def db_type(self, connection):
+        if connection.vendor == 'postgresql':
+            return self.enum_type
+        return super().db_type(connection)
@@ -37,7 +37,8 @@ class TicketFilter(django_filters.FilterSet):
     def filter_search(self, queryset, name, value):
         """
         Search across title and description using case-insensitive contains.
-        This uses database-level ILIKE (PostgreSQL) for performance.
+        On PostgreSQL the ILIKE predicates are served by the pg_trgm GIN
+        indexes from migration 0002 instead of a sequential scan.
         """
         if not value:
             return queryset
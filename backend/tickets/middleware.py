@@ -5,15 +5,26 @@ RequestLoggingMiddleware — logs every request with method, path, status, durat
 ExceptionHandlingMiddleware — catches unhandled exceptions, returns structured JSON.
 """
 
-import json
 import logging
 import time
-import traceback
 
+from django.conf import settings
 from django.http import JsonResponse
 
 logger = logging.getLogger('tickets')
 
+# Bound logger methods resolved once at import — saves an attribute lookup
+# on the logger for every request that passes through the middleware.
+_log = logger.log
+_error = logger.error
+
+# Status class (status_code // 100) → log level. Anything not listed
+# (1xx, 2xx, 3xx, out-of-range codes) logs at INFO.
+_LEVELS = {
+    4: logging.WARNING,
+    5: logging.ERROR,
+}
+
 
 class RequestLoggingMiddleware:
     """
@@ -25,27 +36,25 @@ class RequestLoggingMiddleware:
         ERROR — 5xx responses
     """
 
+    __slots__ = ('_get_response',)
+
     def __init__(self, get_response):
-        self.get_response = get_response
+        self._get_response = get_response
 
     def __call__(self, request):
         start_time = time.monotonic()
 
-        response = self.get_response(request)
+        response = self._get_response(request)
 
         duration_ms = (time.monotonic() - start_time) * 1000
         status_code = response.status_code
-        method = request.method
-        path = request.get_full_path()
-
-        log_message = f'{method} {path} → {status_code} ({duration_ms:.1f}ms)'
 
-        if 500 <= status_code < 600:
-            logger.error(log_message)
-        elif 400 <= status_code < 500:
-            logger.warning(log_message)
-        else:
-            logger.info(log_message)
+        # %-style args — the message is only formatted if a handler emits it
+        _log(
+            _LEVELS.get(status_code // 100, logging.INFO),
+            '%s %s → %d (%.1fms)',
+            request.method, request.get_full_path(), status_code, duration_ms,
+        )
 
         return response
 
@@ -59,24 +68,28 @@ class ExceptionHandlingMiddleware:
     In production, only a generic message is returned (traceback still logged).
     """
 
+    __slots__ = ('_get_response', '_debug')
+
     def __init__(self, get_response):
-        self.get_response = get_response
+        self._get_response = get_response
+        # DEBUG is fixed once settings are loaded — read it a single time
+        self._debug = bool(settings.DEBUG)
 
     def __call__(self, request):
-        return self.get_response(request)
+        return self._get_response(request)
 
     def process_exception(self, request, exception):
-        tb = traceback.format_exc()
-        logger.error(
-            f'Unhandled exception on {request.method} {request.get_full_path()}: '
-            f'{exception.__class__.__name__}: {exception}\n{tb}'
-        )
+        import traceback  # error path only — kept off worker start-up
 
-        from django.conf import settings
+        _error(
+            'Unhandled exception on %s %s: %s: %s\n%s',
+            request.method, request.get_full_path(),
+            exception.__class__.__name__, exception, traceback.format_exc(),
+        )
 
         response_data = {
             'error': 'Internal server error',
-            'detail': str(exception) if settings.DEBUG else 'An unexpected error occurred.',
+            'detail': str(exception) if self._debug else 'An unexpected error occurred.',
         }
 
         return JsonResponse(response_data, status=500)
@@ -0,0 +1,43 @@
+# Trigram indexes backing the ?search= filter on PostgreSQL.
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# `ILIKE '%term%'` (Django's icontains) cannot use a B-tree index, so every
+# search was a sequential scan. A GIN index with gin_trgm_ops lets PostgreSQL
+# answer the same predicate from the index without changing search semantics.
+TRGM_INDEXES = (
+    ('idx_ticket_title_trgm', 'title'),
+    ('idx_ticket_description_trgm', 'description'),
+)
+
+
+def create_trgm_indexes(apps, schema_editor):
+    # Expression/opclass GIN indexes are PostgreSQL-only — the SQLite
+    # development fallback keeps plain LIKE scans.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, column in TRGM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} '
+            f'ON tickets USING gin ({column} gin_trgm_ops)'
+        )
+
+
+def drop_trgm_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _ in TRGM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_trgm_indexes, drop_trgm_indexes),
+    ]
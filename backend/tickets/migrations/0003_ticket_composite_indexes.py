@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-14 04:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0002_ticket_search_trgm'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='ticket',
+            name='idx_ticket_category',
+        ),
+        migrations.RemoveIndex(
+            model_name='ticket',
+            name='idx_ticket_status',
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['status', 'priority', '-created_at'], name='idx_ticket_spc'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['category', '-created_at'], name='idx_ticket_cat_created'),
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-14 04:59
+
+import tickets.fields
+from django.db import migrations
+
+# Native ENUM types backing category/priority/status on PostgreSQL, keyed by
+# the column they replace. Django's AlterField would emit ALTER COLUMN TYPE
+# without a USING cast (both sides are CharFields to it), so the column
+# conversion is done here and the AlterFields only update migration state.
+ENUM_COLUMNS = {
+    'category': ('ticket_category', ('billing', 'technical', 'account', 'general')),
+    'priority': ('ticket_priority', ('low', 'medium', 'high', 'critical')),
+    'status': ('ticket_status', ('open', 'in_progress', 'resolved', 'closed')),
+}
+
+
+def convert_to_enums(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column, (enum_type, labels) in ENUM_COLUMNS.items():
+        values = ', '.join(f"'{label}'" for label in labels)
+        schema_editor.execute(f'CREATE TYPE {enum_type} AS ENUM ({values})')
+        schema_editor.execute(
+            f'ALTER TABLE tickets ALTER COLUMN {column} '
+            f'TYPE {enum_type} USING {column}::{enum_type}'
+        )
+
+
+def convert_to_varchar(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column, (enum_type, _) in ENUM_COLUMNS.items():
+        schema_editor.execute(
+            f'ALTER TABLE tickets ALTER COLUMN {column} '
+            f'TYPE varchar(20) USING {column}::text'
+        )
+        schema_editor.execute(f'DROP TYPE {enum_type}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0003_ticket_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='ticket',
+            name='valid_category',
+        ),
+        migrations.RemoveConstraint(
+            model_name='ticket',
+            name='valid_priority',
+        ),
+        migrations.RemoveConstraint(
+            model_name='ticket',
+            name='valid_status',
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(convert_to_enums, convert_to_varchar),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='ticket',
+                    name='category',
+                    field=tickets.fields.PgEnumField(choices=[('billing', 'Billing'), ('technical', 'Technical'), ('account', 'Account'), ('general', 'General')], default='general', enum_type='ticket_category', help_text='Ticket category — auto-suggested by LLM, user can override', max_length=20),
+                ),
+                migrations.AlterField(
+                    model_name='ticket',
+                    name='priority',
+                    field=tickets.fields.PgEnumField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('critical', 'Critical')], default='medium', enum_type='ticket_priority', help_text='Ticket priority — auto-suggested by LLM, user can override', max_length=20),
+                ),
+                migrations.AlterField(
+                    model_name='ticket',
+                    name='status',
+                    field=tickets.fields.PgEnumField(choices=[('open', 'Open'), ('in_progress', 'In Progress'), ('resolved', 'Resolved'), ('closed', 'Closed')], default='open', enum_type='ticket_status', help_text='Current workflow status', max_length=20),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-14 05:09
+
+import tickets.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0004_ticket_pg_enums'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ticket',
+            name='category',
+            field=tickets.fields.PgEnumField(choices=[('billing', 'Billing'), ('technical', 'Technical'), ('account', 'Account'), ('general', 'General')], default='general', enum_type='ticket_category', help_text='Ticket category — auto-suggested by LLM, user can override', max_length=9),
+        ),
+        migrations.AlterField(
+            model_name='ticket',
+            name='priority',
+            field=tickets.fields.PgEnumField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('critical', 'Critical')], default='medium', enum_type='ticket_priority', help_text='Ticket priority — auto-suggested by LLM, user can override', max_length=8),
+        ),
+        migrations.AlterField(
+            model_name='ticket',
+            name='status',
+            field=tickets.fields.PgEnumField(choices=[('open', 'Open'), ('in_progress', 'In Progress'), ('resolved', 'Resolved'), ('closed', 'Closed')], default='open', enum_type='ticket_status', help_text='Current workflow status', max_length=11),
+        ),
+    ]
@@ -1,12 +1,41 @@
 """
 Ticket model — core data entity for the support ticket system.
 
-All field constraints (choices, NOT NULL) are enforced at the database level
-via Django's CheckConstraint and field options.
+All field constraints (choices, NOT NULL) are enforced at the database level:
+category/priority/status are native ENUM types on PostgreSQL (see
+tickets.fields.PgEnumField), everything else via field options.
 """
 
 from django.db import models
 
+from .fields import PgEnumField
+
+
+class TicketQuerySet(models.QuerySet):
+    """
+    Bulk writes that bypass post_save still invalidate the ticket caches.
+
+    bulk_create() and update() (which bulk_update() also goes through) send
+    no model signals, so they schedule the same coalesced on-commit flush
+    the signal receivers use. Queryset delete() needs nothing: with
+    post_delete receivers connected, Django sends it for every row.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        created = super().bulk_create(objs, *args, **kwargs)
+        if created:
+            # Imported here — tickets.signals imports this module
+            from .signals import invalidate_ticket_caches_on_commit
+            invalidate_ticket_caches_on_commit(self.db)
+        return created
+
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        if rows:
+            from .signals import invalidate_ticket_caches_on_commit
+            invalidate_ticket_caches_on_commit(self.db)
+        return rows
+
 
 class Ticket(models.Model):
     """
@@ -41,6 +70,8 @@ class Ticket(models.Model):
         CLOSED = 'closed', 'Closed'
 
     # --- Fields ---
+    # max_length on the choice fields is the longest choice value, so the
+    # varchar columns on non-PostgreSQL backends are no wider than the data.
     title = models.CharField(
         max_length=200,
         blank=False,
@@ -50,20 +81,23 @@ class Ticket(models.Model):
         blank=False,
         help_text='Full description of the problem',
     )
-    category = models.CharField(
-        max_length=20,
+    category = PgEnumField(
+        enum_type='ticket_category',
+        max_length=9,
         choices=Category.choices,
         default=Category.GENERAL,
         help_text='Ticket category — auto-suggested by LLM, user can override',
     )
-    priority = models.CharField(
-        max_length=20,
+    priority = PgEnumField(
+        enum_type='ticket_priority',
+        max_length=8,
         choices=Priority.choices,
         default=Priority.MEDIUM,
         help_text='Ticket priority — auto-suggested by LLM, user can override',
     )
-    status = models.CharField(
-        max_length=20,
+    status = PgEnumField(
+        enum_type='ticket_status',
+        max_length=11,
         choices=Status.choices,
         default=Status.OPEN,
         help_text='Current workflow status',
@@ -74,33 +108,39 @@ class Ticket(models.Model):
         help_text='Timestamp when the ticket was created',
     )
 
+    objects = TicketQuerySet.as_manager()
+
     class Meta:
         db_table = 'tickets'
         ordering = ['-created_at']
         verbose_name = 'Ticket'
         verbose_name_plural = 'Tickets'
 
-        # Database-level constraints — enforces valid choices even if
-        # data is inserted outside Django (e.g., raw SQL, migrations)
-        constraints = [
-            models.CheckConstraint(
-                condition=models.Q(category__in=['billing', 'technical', 'account', 'general']),
-                name='valid_category',
+        # Valid choices are enforced by the ENUM column types (migration
+        # 0004) even if data is inserted outside Django (raw SQL, scripts),
+        # so no separate CheckConstraints are needed.
+
+        # Composite indexes follow the list endpoint's query shape (filters
+        # + ORDER BY -created_at): each single filter gets an index ending
+        # in -created_at, so a page is an index range scan with no sort.
+        # idx_ticket_spc also covers the status + priority combination.
+        indexes = [
+            models.Index(
+                fields=['priority', '-created_at'],
+                name='idx_ticket_pri_created',
             ),
-            models.CheckConstraint(
-                condition=models.Q(priority__in=['low', 'medium', 'high', 'critical']),
-                name='valid_priority',
+            models.Index(
+                fields=['status', '-created_at'],
+                name='idx_ticket_status_created',
             ),
-            models.CheckConstraint(
-                condition=models.Q(status__in=['open', 'in_progress', 'resolved', 'closed']),
-                name='valid_status',
+            models.Index(
+                fields=['status', 'priority', '-created_at'],
+                name='idx_ticket_spc',
+            ),
+            models.Index(
+                fields=['category', '-created_at'],
+                name='idx_ticket_cat_created',
             ),
-        ]
-
-        indexes = [
-            models.Index(fields=['category'], name='idx_ticket_category'),
-            models.Index(fields=['priority'], name='idx_ticket_priority'),
-            models.Index(fields=['status'], name='idx_ticket_status'),
         ]
 
     def __str__(self):
@@ -0,0 +1,81 @@
+"""
+Pagination for the ticket list endpoint.
+
+TicketPagination — page-number pagination whose COUNT(*) is served from cache
+get_or_set_for_generation — cache helper for values invalidated by ticket writes
+"""
+
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+
+# Current generation of ticket-derived cache entries (list counts and the
+# /stats/ payload). Replaced with a fresh token on every ticket write (see
+# tickets.signals), which orphans every entry stored under the old one.
+GENERATION_KEY = 'tickets:count:gen'
+
+
+def new_generation() -> str:
+    """Random token for GENERATION_KEY — never reused, even after eviction."""
+    return os.urandom(8).hex()
+
+
+def get_or_set_for_generation(key, compute, timeout):
+    """
+    cache.get_or_set() for a value derived from the tickets table.
+
+    The value is stored with the generation read *before* it was computed,
+    so a result built from pre-write rows that lands after the write's
+    flush carries the old token and is never served. The generation and
+    the entry are fetched in one round-trip.
+    """
+    cached = cache.get_many((GENERATION_KEY, key))
+    generation = cached.get(GENERATION_KEY)
+    entry = cached.get(key)
+    if generation is not None and entry is not None and entry[0] == generation:
+        return entry[1]
+
+    if generation is None:
+        # First request (or the token was evicted) — start a generation
+        # no previously stored entry can match.
+        generation = new_generation()
+        if not cache.add(GENERATION_KEY, generation, timeout=None):
+            generation = cache.get(GENERATION_KEY, generation)
+
+    value = compute()
+    cache.set(key, (generation, value), timeout)
+    return value
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator that caches the total row count per filtered query.
+
+    The count key is a digest of the compiled list SQL, so every
+    filter/search combination gets its own entry, versioned by
+    get_or_set_for_generation().
+    """
+
+    @cached_property
+    def count(self):
+        sql, params = self.object_list.query.sql_with_params()
+        count_key = 'tickets:count:' + hashlib.blake2b(
+            repr((sql, params)).encode(), digest_size=16,
+        ).hexdigest()
+        return get_or_set_for_generation(
+            count_key, lambda: Paginator.count.func(self), settings.LIST_COUNT_CACHE_TIMEOUT,
+        )
+
+
+class TicketPagination(PageNumberPagination):
+    """
+    Same `?page=` contract and `count` field the frontend relies on, but
+    repeated list requests skip the SELECT COUNT(*) until a ticket changes.
+    """
+
+    django_paginator_class = CachedCountPaginator
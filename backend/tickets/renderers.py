@@ -0,0 +1,56 @@
+"""
+orjson-backed JSON renderer and parser for DRF.
+
+ORJSONRenderer — serializes responses with orjson (Rust) instead of stdlib json
+ORJSONParser — parses JSON request bodies with orjson
+"""
+
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Types orjson does not handle natively (Decimal, lazy translation strings,
+# querysets, ...) are handed to DRF's own encoder.
+_drf_default = JSONEncoder().default
+
+# UTC datetimes end in "Z", exactly like DRF's DateTimeField output, so
+# serializers may hand datetimes straight to the renderer.
+_ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in replacement for DRF's JSONRenderer.
+
+    Compact output is encoded by orjson. Indented output (`?indent=` media
+    type parameter, browsable API) goes through the stdlib renderer, since
+    orjson only supports a fixed 2-space indent.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=_drf_default, option=_ORJSON_OPTIONS)
+
+        # Keep DRF's guarantee that output is a strict JavaScript subset
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    """Parses UTF-8 JSON request bodies with orjson."""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -2,16 +2,41 @@
 DRF serializers for the Ticket model.
 
 TicketSerializer — full CRUD serializer
+TicketListSerializer — compact read-only rows for the list endpoint
 TicketUpdateSerializer — restricted to status/category/priority (PATCH)
 ClassifyRequestSerializer — input validation for the classify endpoint
+ClassifyBatchRequestSerializer — input validation for the batch classify endpoint
 """
 
+import copy
+
 from rest_framework import serializers
 
 from .models import Ticket
 
 
-class TicketSerializer(serializers.ModelSerializer):
+class CachedFieldsMixin:
+    """
+    Build a ModelSerializer's fields once per class instead of per instance.
+
+    ModelSerializer.get_fields() re-runs model introspection and deep-copies
+    every declared field for each serializer it creates — most of the cost
+    of validating or rendering a ticket. The unbound fields are kept as a
+    class-level prototype and each instance gets shallow copies, which
+    binding then gives their own parent / field_name / source. Only for
+    flat serializers: nested serializers and ListField children would
+    share the prototype's child.
+    """
+
+    def get_fields(self):
+        cls = type(self)
+        prototype = cls.__dict__.get('_field_prototype')
+        if prototype is None:
+            prototype = cls._field_prototype = super().get_fields()
+        return {name: copy.copy(field) for name, field in prototype.items()}
+
+
+class TicketSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Full serializer for creating and reading tickets.
     `created_at` is read-only (auto-set by the database).
@@ -37,17 +62,80 @@ class TicketSerializer(serializers.ModelSerializer):
         return value.strip()
 
 
-class TicketUpdateSerializer(serializers.ModelSerializer):
+class TicketListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    """
+    Read-only serializer for GET /api/tickets/.
+
+    Ships a short `description_preview` instead of the full description.
+    Expects the queryset to annotate `description_head` — the first
+    DESCRIPTION_PREVIEW_LENGTH + 1 characters, cut in the database so the
+    full text never leaves PostgreSQL (see TicketViewSet.get_queryset).
+    """
+
+    DESCRIPTION_PREVIEW_LENGTH = 120
+
+    description_preview = serializers.SerializerMethodField()
+    # Passed through as a datetime: ORJSONRenderer encodes it in C, in the
+    # same ISO 8601 "...Z" form DateTimeField would build per row (the
+    # project runs with TIME_ZONE = 'UTC', so no conversion is skipped).
+    created_at = serializers.ReadOnlyField()
+
+    class Meta:
+        model = Ticket
+        fields = [
+            'id', 'title', 'description_preview',
+            'category', 'priority', 'status',
+            'created_at',
+        ]
+        read_only_fields = fields
+
+    def get_description_preview(self, obj):
+        head = obj.description_head
+        if len(head) > self.DESCRIPTION_PREVIEW_LENGTH:
+            return head[:self.DESCRIPTION_PREVIEW_LENGTH] + '...'
+        return head
+
+
+# Formats created_at exactly as TicketSerializer's auto-built field does.
+# Kept at module level: a Field declared on the class would become a
+# serializer field.
+_CREATED_AT_FIELD = serializers.DateTimeField(read_only=True)
+
+
+class TicketUpdateSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Restricted serializer for PATCH updates.
     Only allows changing status, category, and priority.
     Title and description are immutable after creation.
+
+    Its output is the full TicketSerializer representation, so the PATCH
+    response needs no second serializer.
     """
 
     class Meta:
         model = Ticket
         fields = ['status', 'category', 'priority']
 
+    def update(self, instance, validated_data):
+        # UPDATE only the submitted columns — never rewrite title/description
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=list(validated_data))
+        return instance
+
+    def to_representation(self, instance):
+        # Every ticket field is a plain column, so the dict is read straight
+        # off the instance rather than walking TicketSerializer's fields.
+        return {
+            'id': instance.id,
+            'title': instance.title,
+            'description': instance.description,
+            'category': instance.category,
+            'priority': instance.priority,
+            'status': instance.status,
+            'created_at': _CREATED_AT_FIELD.to_representation(instance.created_at),
+        }
+
 
 class ClassifyRequestSerializer(serializers.Serializer):
     """
@@ -65,3 +153,20 @@ class ClassifyRequestSerializer(serializers.Serializer):
         if not value or not value.strip():
             raise serializers.ValidationError('Description cannot be blank.')
         return value.strip()
+
+
+class ClassifyBatchRequestSerializer(serializers.Serializer):
+    """
+    Input serializer for the /api/tickets/classify-batch/ endpoint.
+    Accepts up to MAX_DESCRIPTIONS descriptions, each validated like the
+    single classify endpoint's.
+    """
+
+    MAX_DESCRIPTIONS = 32
+
+    descriptions = serializers.ListField(
+        child=serializers.CharField(min_length=10),
+        allow_empty=False,
+        max_length=MAX_DESCRIPTIONS,
+        help_text='Ticket descriptions to classify via LLM, in order.',
+    )
@@ -6,22 +6,56 @@ It is isolated from Django views for testability and swappability.
 
 Query Optimization Strategy:
   1. Few-shot examples — ground the model with concrete input/output pairs
-  2. Chain-of-thought — force the model to reason before answering
+  2. Chain-of-thought — worked analyses in every example show the reasoning
   3. Keyword pre-extraction — highlight urgency/domain signals in the prompt
   4. Response schema enforcement — use Gemini's JSON mode
   5. Validation + fallback — never trust raw LLM output
 """
 
-import json
+import collections
+import concurrent.futures
+import functools
+import hashlib
 import logging
 import os
+import random
 import re
+import threading
+from typing import NamedTuple
+
+import orjson
+
+try:
+    import hyperscan
+except ImportError:  # Optional accelerator — the stdlib `re` scanner is used instead
+    hyperscan = None
 
 logger = logging.getLogger('tickets')
 
 # Valid choices — used for response validation
-VALID_CATEGORIES = {'billing', 'technical', 'account', 'general'}
-VALID_PRIORITIES = {'low', 'medium', 'high', 'critical'}
+VALID_CATEGORIES = frozenset({'billing', 'technical', 'account', 'general'})
+VALID_PRIORITIES = frozenset({'low', 'medium', 'high', 'critical'})
+
+# Gemini structured output — constrains the model to exactly this object.
+# _parse_response still validates it; the schema is not a trust boundary.
+RESPONSE_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'suggested_category': {
+            'type': 'string', 'format': 'enum', 'enum': sorted(VALID_CATEGORIES),
+        },
+        'suggested_priority': {
+            'type': 'string', 'format': 'enum', 'enum': sorted(VALID_PRIORITIES),
+        },
+    },
+    'required': ['suggested_category', 'suggested_priority'],
+}
+
+# Output cap for the schema-constrained answer. The longest possible object,
+# {"suggested_category": "technical", "suggested_priority": "critical"},
+# is ~20 tokens; the rest is headroom for whitespace the model may add.
+# Fixed rather than measured with count_tokens(), which is a network call.
+MAX_OUTPUT_TOKENS = 32
 
 # Default fallback when LLM is unavailable or returns invalid data
 DEFAULT_RESPONSE = {
@@ -63,18 +97,66 @@ CATEGORY_SIGNALS = {
     ),
 }
 
+# Priority cues used only by the keyword fallback
+EXTREME_URGENCY_KEYWORDS = re.compile(
+    r'\b(die|death|life.?threatening|emergency|production.?down|'
+    r'data.?loss|security.?breach|outage)\b',
+    re.IGNORECASE,
+)
+BROKEN_KEYWORDS = re.compile(
+    r'\b(not.?working|broken|fail|crash|error|cannot|can\'t|won\'t)\b',
+    re.IGNORECASE,
+)
+
+# Response parsing — the embedded JSON answer object
+_JSON_OBJECT = re.compile(r'\{[^{}]*"suggested_category"[^{}]*\}')
+# The search can backtrack on long input, so it only ever sees this much
+# of a response — far more than MAX_OUTPUT_TOKENS can produce.
+_MAX_RESPONSE_CHARS = 4096
+
+# All signal families folded into one alternation with a named group per
+# family, so a description is walked once instead of once per pattern.
+# The keyword sets are disjoint, so this finds the same matches as running
+# each pattern on its own.
+_SIGNAL_PATTERNS = {'urgency': URGENCY_KEYWORDS, **CATEGORY_SIGNALS}
+_COMBINED_SIGNALS = re.compile(
+    '|'.join(f'(?P<{name}>{p.pattern})' for name, p in _SIGNAL_PATTERNS.items()),
+    re.IGNORECASE,
+)
+_SIGNAL_NAMES = tuple(_SIGNAL_PATTERNS)
+
+# Hyperscan compiles the same families (expression id = index into
+# _SIGNAL_NAMES) into one multi-pattern DFA database. When the package is
+# installed _scan_signals uses it instead of the backtracking `re` engine.
+_HS_SIGNALS = None
+if hyperscan is not None:
+    _HS_SIGNALS = hyperscan.Database()
+    _HS_SIGNALS.compile(
+        expressions=[p.pattern.encode() for p in _SIGNAL_PATTERNS.values()],
+        ids=list(range(len(_SIGNAL_NAMES))),
+        elements=len(_SIGNAL_NAMES),
+        flags=[
+            hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST
+        ] * len(_SIGNAL_NAMES),
+    )
+
+# Hyperscan scratch space must not be shared between concurrent scans
+# (gthread workers run several request threads per process).
+_hs_local = threading.local()
+
 # =============================================================================
 # CLASSIFICATION PROMPT — Chain-of-thought with few-shot examples
 # =============================================================================
 # Assessment note: This prompt uses several optimization techniques:
 #   - System-level role definition
 #   - Explicit decision criteria with examples
-#   - Few-shot demonstrations (5 examples covering edge cases)
-#   - Chain-of-thought reasoning (think → then answer)
+#   - Few-shot demonstrations (5 examples covering edge cases; trimmed to
+#     the relevant ones for clear single-category tickets)
+#   - Chain-of-thought analyses in each example (reason → then answer)
 #   - Structured keyword hints to reduce ambiguity
 #   - Strict JSON output schema
 
-CLASSIFICATION_PROMPT = """You are an expert support ticket classifier. Your job is to accurately categorize customer tickets and assign the correct priority.
+_PROMPT_RULES = """You are an expert support ticket classifier. Your job is to accurately categorize customer tickets and assign the correct priority.
 
 ## STEP 1 — Determine Category (exactly one):
 | Category   | When to use                                                                     |
@@ -99,72 +181,404 @@ CLASSIFICATION_PROMPT = """You are an expert support ticket classifier. Your job
 - Feature requests or general questions with no urgency → **low**
 - When in doubt between two levels → pick the HIGHER one
 
-## FEW-SHOT EXAMPLES:
-
-Input: "I was charged twice for my subscription this month. Please refund the duplicate charge."
+"""
+# Few-shot examples tagged with the category they demonstrate. Tickets
+# whose signals clearly point at one category get a prompt carrying only
+# that category's examples plus the low-priority anchor (see
+# _prompt_variant); everything else gets all five.
+_FEW_SHOT_EXAMPLES = (
+    ('billing', """Input: "I was charged twice for my subscription this month. Please refund the duplicate charge."
 Analysis: Payment/charge issue → billing. Overcharge but not urgent → medium.
-Output: {"suggested_category": "billing", "suggested_priority": "medium"}
-
-Input: "The app crashes every time I try to open the dashboard. I've tried restarting but it still crashes."
+Output: {"suggested_category": "billing", "suggested_priority": "medium"}"""),
+    ('technical', """Input: "The app crashes every time I try to open the dashboard. I've tried restarting but it still crashes."
 Analysis: App crash, no workaround (tried restarting) → technical. Major broken feature → high.
-Output: {"suggested_category": "technical", "suggested_priority": "high"}
-
-Input: "I can't log in after changing my password yesterday. I've tried the reset link but get an error."
+Output: {"suggested_category": "technical", "suggested_priority": "high"}"""),
+    ('account', """Input: "I can't log in after changing my password yesterday. I've tried the reset link but get an error."
 Analysis: Login + password issue → account. Locked out with no workaround → high.
-Output: {"suggested_category": "account", "suggested_priority": "high"}
-
-Input: "Would be nice to have dark mode in the settings page."
+Output: {"suggested_category": "account", "suggested_priority": "high"}"""),
+    ('general', """Input: "Would be nice to have dark mode in the settings page."
 Analysis: Feature request, no issue → general. No urgency → low.
-Output: {"suggested_category": "general", "suggested_priority": "low"}
-
-Input: "Our entire team cannot access the platform. Production is down. This is urgent, we need help immediately!"
+Output: {"suggested_category": "general", "suggested_priority": "low"}"""),
+    ('technical', """Input: "Our entire team cannot access the platform. Production is down. This is urgent, we need help immediately!"
 Analysis: Platform down + "urgent" + "immediately" → technical. Production down + urgency language → critical.
-Output: {"suggested_category": "technical", "suggested_priority": "critical"}
+Output: {"suggested_category": "technical", "suggested_priority": "critical"}"""),
+)
+_LOW_PRIORITY_EXAMPLE = _FEW_SHOT_EXAMPLES[3][1]
 
-## YOUR TASK:
-Analyze the ticket below. First identify keyword signals, then reason about category and priority, then output ONLY the JSON.
+_PROMPT_TASK = """## YOUR TASK:
+Analyze the ticket below. Use the keyword signals and apply the rules above to decide category and priority, then output ONLY the JSON.
 
 """
 
 
-def _extract_signals(description: str) -> str:
+def _assemble_prompt(examples) -> str:
+    return ''.join((
+        _PROMPT_RULES, '## FEW-SHOT EXAMPLES:\n\n',
+        '\n\n'.join(examples), '\n\n', _PROMPT_TASK,
+    ))
+
+
+CLASSIFICATION_PROMPT = _assemble_prompt(text for _, text in _FEW_SHOT_EXAMPLES)
+
+# System prompt per variant: None → the full prompt, category → specialized
+_SYSTEM_PROMPTS = {
+    None: CLASSIFICATION_PROMPT,
+    **{
+        cat: _assemble_prompt(
+            [text for tag, text in _FEW_SHOT_EXAMPLES if tag == cat] + [_LOW_PRIORITY_EXAMPLE]
+        )
+        for cat in CATEGORY_SIGNALS
+    },
+}
+
+# Static framing around the per-ticket parts of the prompt, kept as
+# constants so _build_prompt assembles the user turn with a single join.
+_SIGNALS_HEADER = '\n### Extracted Signals:\n'
+_DESCRIPTION_HEADER = '### Ticket Description:\n'
+_PROMPT_SUFFIX = '\n\n### Output:\n'
+
+
+def _scan_signals(description: str) -> dict:
+    """
+    Single pass over the description with the combined signal scanner.
+
+    Returns {family: [matched keywords, in order]} for 'urgency' and every
+    CATEGORY_SIGNALS key — families with no matches map to an empty list.
+    """
+    # Hyperscan's \b and case folding are ASCII-only; non-ASCII text keeps
+    # the Unicode-aware `re` semantics.
+    if _HS_SIGNALS is not None and description.isascii():
+        return _scan_signals_hyperscan(description)
+
+    buckets = {name: [] for name in _SIGNAL_NAMES}
+    for match in _COMBINED_SIGNALS.finditer(description):
+        buckets[match.lastgroup].append(match.group(match.lastgroup))
+    return buckets
+
+
+def _scan_signals_hyperscan(description: str) -> dict:
+    """Hyperscan-backed _scan_signals — same result shape and matches."""
+    hits = []
+
+    def on_match(family_id, start, end, flags, context):
+        hits.append((start, end, family_id))
+
+    scratch = getattr(_hs_local, 'scratch', None)
+    if scratch is None:
+        scratch = _hs_local.scratch = hyperscan.Scratch(_HS_SIGNALS)
+    _HS_SIGNALS.scan(description.encode(), match_event_handler=on_match, scratch=scratch)
+
+    # Hyperscan reports every match end; keep the leftmost non-overlapping
+    # ones, which is what re.finditer would have returned. The text is ASCII,
+    # so byte offsets index the str directly.
+    buckets = {name: [] for name in _SIGNAL_NAMES}
+    last_end = 0
+    for start, end, family_id in sorted(hits):
+        if start < last_end:
+            continue
+        buckets[_SIGNAL_NAMES[family_id]].append(description[start:end])
+        last_end = end
+    return buckets
+
+
+def _extract_signals(description: str, signals: dict | None = None) -> str:
     """
     Pre-extract keyword signals from the description.
 
     Returns a structured hint block that is prepended to the ticket text,
     so the LLM receives both the raw description AND extracted signals.
     This dramatically reduces misclassification on ambiguous tickets.
+    `signals` is a precomputed _scan_signals() result, if the caller has one.
+    Keywords are deduplicated in first-seen order, so the same ticket always
+    yields the same hint block.
     """
     hints = []
+    if signals is None:
+        signals = _scan_signals(description)
 
     # Urgency signals
-    urgency_matches = URGENCY_KEYWORDS.findall(description)
+    urgency_matches = signals['urgency']
     if urgency_matches:
-        hints.append(f"⚠️ URGENCY SIGNALS DETECTED: {', '.join(set(m.lower() for m in urgency_matches))}")
+        hints.append(f"⚠️ URGENCY SIGNALS DETECTED: {', '.join(dict.fromkeys(map(str.lower, urgency_matches)))}")
 
     # Category signals
-    category_scores = {}
-    for cat, pattern in CATEGORY_SIGNALS.items():
-        matches = pattern.findall(description)
+    for cat in CATEGORY_SIGNALS:
+        matches = signals[cat]
         if matches:
-            category_scores[cat] = matches
-    if category_scores:
-        for cat, matches in category_scores.items():
-            hints.append(f"📌 {cat.upper()} keywords: {', '.join(set(m.lower() for m in matches))}")
+            hints.append(f"📌 {cat.upper()} keywords: {', '.join(dict.fromkeys(map(str.lower, matches)))}")
 
     return '\n'.join(hints)
 
 
+@functools.cache
+def _genai():
+    """
+    Import the Gemini SDK on first use.
+
+    google.generativeai pulls in grpc/protobuf; deferring it keeps Django
+    start-up, management commands and test runs from paying for it until a
+    classification actually reaches the API (or warm_up() runs).
+    """
+    import google.generativeai as genai
+    return genai
+
+
+def warm_up() -> None:
+    """
+    Import the Gemini SDK ahead of time when an API key is configured.
+
+    Called from Gunicorn's `when_ready` hook in the preloaded master, so
+    every forked worker, including those respawned by max_requests,
+    inherits the imported modules copy-on-write instead of re-importing
+    them on its first classification. No client is built here: gRPC
+    channels must not be created before fork.
+    """
+    if not os.environ.get('GEMINI_API_KEY'):
+        return
+    try:
+        _genai()
+    except ImportError:
+        logger.warning('google-generativeai is not installed — keyword fallback only')
+
+
+# Per-call options for generate_content — a 10s cap keeps a slow API from
+# pinning a request thread; timeouts fall through to the keyword fallback.
+_REQUEST_OPTIONS = {'timeout': 10}
+
+
+@functools.lru_cache(maxsize=1)
+def _configure(api_key: str):
+    """
+    Configure the Gemini SDK once per API key.
+
+    genai.configure() sets up credentials and the transport; doing that
+    once (instead of per call) keeps the channel warm, and processes that
+    never classify — admin-only or health-check workers — never build a
+    client at all.
+    """
+    genai = _genai()
+    # gRPC: one long-lived, multiplexed HTTP/2 channel per process. Every
+    # request thread (gthread) and classify_batch() call shares it, so
+    # concurrent classifications add streams, not TCP/TLS handshakes.
+    genai.configure(api_key=api_key, transport='grpc')
+    return genai
+
+
+@functools.lru_cache(maxsize=len(_SYSTEM_PROMPTS))
+def _gemini_model(api_key: str, variant: str | None = None):
+    """
+    Build the Gemini model for one system-prompt variant, once per API key.
+
+    See _prompt_variant — there are at most len(_SYSTEM_PROMPTS) of them.
+    """
+    genai = _configure(api_key)
+    # The static preamble rides on the model as its system instruction, so
+    # each request only carries the per-ticket user turn. The generation
+    # config (incl. the response schema → proto conversion) is likewise
+    # built once here instead of on every generate_content() call.
+    return genai.GenerativeModel(
+        'gemini-1.5-flash',
+        system_instruction=_SYSTEM_PROMPTS[variant],
+        generation_config=genai.types.GenerationConfig(
+            temperature=0.05,       # Near-deterministic for consistent results
+            max_output_tokens=MAX_OUTPUT_TOKENS,  # The schema-constrained JSON object only
+            top_p=0.9,              # Focused sampling
+            response_mime_type='application/json',
+            response_schema=RESPONSE_SCHEMA,
+        ),
+    )
+
+
+def _prompt_variant(signals: dict) -> str | None:
+    """
+    Pick the specialized system prompt for a ticket, or None for the full one.
+
+    A variant is used only when one category clearly dominates the keyword
+    signals (at least twice the runner-up's hits) and no urgency signal is
+    present — urgent tickets keep every example, the critical one included,
+    since priority calibration is where the examples matter most.
+    """
+    if signals['urgency']:
+        return None
+    ranked = sorted(CATEGORY_SIGNALS, key=lambda cat: len(signals[cat]), reverse=True)
+    top, runner_up = len(signals[ranked[0]]), len(signals[ranked[1]])
+    if top == 0 or top < 2 * runner_up:
+        return None
+    return ranked[0]
+
+
+def _build_prompt(description: str, signals: dict | None = None) -> str:
+    """
+    Assemble the per-ticket user turn: optional signal block + description.
+
+    CLASSIFICATION_PROMPT is not part of it — it is the system instruction
+    of the cached model (see _gemini_model), so the ~4KB preamble is neither
+    copied nor re-sent as user content on every call.
+    """
+    hints = _extract_signals(description, signals)
+    if hints:
+        return ''.join((
+            _SIGNALS_HEADER, hints, '\n',
+            _DESCRIPTION_HEADER, description, _PROMPT_SUFFIX,
+        ))
+    return ''.join((_DESCRIPTION_HEADER, description, _PROMPT_SUFFIX))
+
+
+# ── Exact-match result cache ─────────────────────────────────────────────────
+# Retries and bulk imports resubmit the same description; a hit skips the
+# Gemini round-trip entirely. Keys are a digest of the normalized text
+# (lowercased word tokens, so case, whitespace and punctuation differences
+# still hit) so long descriptions are not retained. Word order is kept:
+# "billing, not technical" must not share an answer with its reverse.
+# Only clean Gemini answers are stored — fallback results carrying a
+# `warning` come from transient failures and must be retried.
+_RESULT_CACHE_SIZE = 4096
+_result_cache = collections.OrderedDict()
+_result_cache_lock = threading.Lock()
+_CACHE_WORDS = re.compile(r"\w+(?:'\w+)*")
+
+
+class Classification(NamedTuple):
+    """
+    Validated labels for one ticket.
+
+    The compact form held by the result cache — a 2-slot tuple rather than
+    a dict per entry. API callers get the dict shape via as_dict().
+    """
+
+    category: str
+    priority: str
+
+    def as_dict(self) -> dict:
+        return {'suggested_category': self.category, 'suggested_priority': self.priority}
+
+
+def _cache_key(description: str) -> bytes:
+    normalized = ' '.join(_CACHE_WORDS.findall(description.lower()))
+    return hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+
+
+def _cache_get(key: bytes) -> Classification | None:
+    with _result_cache_lock:
+        labels = _result_cache.get(key)
+        if labels is not None:
+            _result_cache.move_to_end(key)
+    return labels
+
+
+def _cache_put(key: bytes, result: dict) -> None:
+    labels = Classification(result['suggested_category'], result['suggested_priority'])
+    with _result_cache_lock:
+        _result_cache[key] = labels
+        _result_cache.move_to_end(key)
+        if len(_result_cache) > _RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+
+
+# ── Shared result cache (optional second tier) ─────────────────────────────
+# The cache above is per process, so every Gunicorn worker pays for its own
+# first Gemini call per description. set_shared_cache() plugs in a store
+# all workers see — anything with Django-cache-style get()/set(), which keeps
+# this module free of Django imports (TicketsConfig wires in the Redis
+# cache when one is configured). Shared-cache errors never fail a request.
+_shared_cache = None
+_shared_cache_timeout = None
+
+
+def set_shared_cache(backend, timeout: int | None) -> None:
+    """Use `backend` as a cross-process result cache (None to disable)."""
+    global _shared_cache, _shared_cache_timeout
+    _shared_cache, _shared_cache_timeout = backend, timeout
+
+
+def _shared_key(key: bytes) -> str:
+    return 'tickets:classify:' + key.hex()
+
+
+def _shared_get(key: bytes) -> Classification | None:
+    try:
+        labels = _shared_cache.get(_shared_key(key))
+    except Exception as e:
+        logger.debug('Shared classification cache read failed: %s', e)
+        return None
+    return Classification(*labels) if labels is not None else None
+
+
+def _shared_put(key: bytes, result: dict) -> None:
+    # Plain tuple, not the NamedTuple: the stored value outlives deploys
+    labels = (result['suggested_category'], result['suggested_priority'])
+    try:
+        _shared_cache.set(_shared_key(key), labels, _shared_cache_timeout)
+    except Exception as e:
+        logger.debug('Shared classification cache write failed: %s', e)
+
+
+# Gemini calls in flight, by cache key. A request for a description that is
+# already being classified (the ticket form classifies both on a typing
+# pause and on blur) waits for that call instead of issuing a second one,
+# so duplicate requests hold a thread but not another upstream call.
+_inflight: dict[bytes, concurrent.futures.Future] = {}
+
+
+# Max concurrent Gemini calls issued by LLMService.classify_batch(), per
+# process: every batch shares this one pool, so concurrent batch requests
+# (one per gthread worker thread) queue instead of each adding threads.
+# Threads start on first submit, so nothing runs in the pre-fork master.
+_BATCH_CONCURRENCY = 8
+_batch_pool = concurrent.futures.ThreadPoolExecutor(
+    max_workers=_BATCH_CONCURRENCY, thread_name_prefix='llm-batch',
+)
+
+# ── Decisive-signal short-circuit ────────────────────────────────────────────
+# Tickets whose keywords settle both labels are answered without Gemini.
+# A small sample still goes to the model so disagreement shows up in logs.
+_DECISIVE_MIN_HITS = 3
+_SHADOW_SAMPLE_RATE = 0.01
+
+# Shadow checks run off the request thread — a sampled request returns the
+# heuristic answer at once instead of waiting up to a full Gemini timeout.
+# At most _SHADOW_MAX_PENDING are queued or running; beyond that (e.g. while
+# Gemini is slow) samples are dropped rather than piling up. The pool only
+# starts threads on first submit, so nothing runs in the pre-fork master.
+_SHADOW_MAX_PENDING = 4
+_shadow_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix='llm-shadow')
+_shadow_slots = threading.BoundedSemaphore(_SHADOW_MAX_PENDING)
+
+
+def _decisive_result(description: str, signals: dict) -> dict | None:
+    """
+    Return the heuristic answer when the keyword signals leave no doubt.
+
+    Decisive means one category with at least _DECISIVE_MIN_HITS keyword
+    hits and at least twice as many as the runner-up, plus a priority the
+    prompt's own rules force: critical (3+ urgency hits or an extreme
+    urgency word). Lower priorities depend on context the keywords cannot
+    see, so those tickets still go to Gemini. Returns None otherwise.
+    """
+    ranked = sorted((len(signals[cat]) for cat in CATEGORY_SIGNALS), reverse=True)
+    if ranked[0] < _DECISIVE_MIN_HITS or ranked[0] < 2 * ranked[1]:
+        return None
+    if len(signals['urgency']) < 3 and not EXTREME_URGENCY_KEYWORDS.search(description):
+        return None
+
+    category = max(CATEGORY_SIGNALS, key=lambda cat: len(signals[cat]))
+    return {
+        'suggested_category': category,
+        'suggested_priority': 'critical',
+        'source': 'heuristic',
+    }
+
+
 class LLMService:
     """
     Handles LLM-based ticket classification via Google Gemini API.
 
     Optimization techniques used:
       1. Few-shot prompting with 5 diverse examples
-      2. Chain-of-thought reasoning (analyze → then answer)
+      2. Chain-of-thought analyses in the examples (analyze → then answer)
       3. Keyword pre-extraction to highlight domain signals
       4. Low temperature (0.05) for deterministic output
-      5. Strict JSON output format with validation
+      5. Schema-constrained JSON output (JSON mode) with validation
       6. Fallback to keyword-based heuristic when LLM fails
     """
 
@@ -174,10 +588,16 @@ class LLMService:
         Classify a ticket description into a category and priority.
 
         Pipeline:
-          1. Extract keyword signals from description
-          2. Call Gemini with optimized prompt + signals + description
-          3. Parse and validate response
-          4. On any failure → fall back to keyword heuristic
+          1. Return a cached answer for a previously seen description
+             (this process first, then the shared cache if configured)
+          2. Extract keyword signals from description (one scan, shared by
+             the prompt and the fallback)
+          3. If the signals are decisive, answer without Gemini (a sampled
+             shadow check runs in the background, never on this thread)
+          4. Call Gemini with optimized prompt + signals + description
+             (concurrent requests for the same description share one call)
+          5. Parse and validate response
+          6. On any failure → fall back to keyword heuristic
         """
         api_key = os.environ.get('GEMINI_API_KEY', '')
 
@@ -185,18 +605,115 @@ class LLMService:
             logger.warning('GEMINI_API_KEY not set — using keyword heuristic')
             return LLMService._keyword_fallback(description)
 
+        key = _cache_key(description)
+        labels = _cache_get(key)
+        if labels is None and _shared_cache is not None:
+            labels = _shared_get(key)
+            if labels is not None:
+                _cache_put(key, labels.as_dict())
+        if labels is not None:
+            return labels.as_dict()
+
+        signals = _scan_signals(description)
+        decisive = _decisive_result(description, signals)
+        if decisive is not None:
+            if random.random() < _SHADOW_SAMPLE_RATE and _shadow_slots.acquire(blocking=False):
+                try:
+                    _shadow_pool.submit(
+                        LLMService._shadow_check, api_key, description, signals, dict(decisive),
+                    )
+                except RuntimeError:
+                    # Pool shut down (interpreter exit) — the check never runs
+                    _shadow_slots.release()
+            return decisive
+
+        with _result_cache_lock:
+            pending = _inflight.get(key)
+            leader = pending is None
+            if leader:
+                pending = _inflight[key] = concurrent.futures.Future()
+        if not leader:
+            return dict(pending.result())
+
         try:
-            return LLMService._call_gemini(api_key, description)
+            result = LLMService._classify_with_gemini(api_key, key, description, signals)
+            pending.set_result(result)
+            return result
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with _result_cache_lock:
+                del _inflight[key]
+
+    @staticmethod
+    def _classify_with_gemini(api_key: str, key: bytes, description: str, signals: dict) -> dict:
+        """One Gemini round-trip for classify(); caches clean answers."""
+        try:
+            result = LLMService._call_gemini(api_key, description, signals)
+            if 'warning' not in result:
+                _cache_put(key, result)
+                if _shared_cache is not None:
+                    _shared_put(key, result)
+            return result
         except Exception as e:
-            logger.error(f'LLM classification failed: {e.__class__.__name__}: {e}')
+            logger.error('LLM classification failed: %s: %s', e.__class__.__name__, e)
             # Fall back to keyword-based classification instead of returning
             # generic defaults — this gives much better results than "general/medium"
-            result = LLMService._keyword_fallback(description)
+            result = LLMService._keyword_fallback(description, signals)
             result['warning'] = f'LLM unavailable, used keyword analysis: {str(e)}'
             return result
 
     @staticmethod
-    def _call_gemini(api_key: str, description: str) -> dict:
+    def _shadow_check(api_key: str, description: str, signals: dict, decisive: dict) -> None:
+        """
+        Compare a short-circuited answer with Gemini's; log disagreement only.
+
+        Runs on _shadow_pool, so nothing may escape: every failure is logged
+        and the pending slot is always released.
+        """
+        try:
+            llm = LLMService._call_gemini(api_key, description, signals)
+            if 'warning' in llm:
+                return
+            if (llm['suggested_category'], llm['suggested_priority']) != (
+                decisive['suggested_category'], decisive['suggested_priority'],
+            ):
+                logger.info(
+                    'Heuristic/LLM disagreement: heuristic=%s/%s llm=%s/%s',
+                    decisive['suggested_category'], decisive['suggested_priority'],
+                    llm['suggested_category'], llm['suggested_priority'],
+                )
+        except Exception as e:
+            logger.debug('Shadow classification failed: %s', e)
+        finally:
+            _shadow_slots.release()
+
+    @staticmethod
+    def classify_batch(descriptions: list[str]) -> list[dict]:
+        """
+        Classify several descriptions, e.g. for ticket imports or backfills.
+
+        Identical descriptions are classified once. The unique ones go
+        through classify() — so cache hits, validation and the keyword
+        fallback behave exactly as for single tickets — with up to
+        _BATCH_CONCURRENCY Gemini calls in flight at a time (on the shared
+        _batch_pool) instead of one after another. Results are returned in input order, one dict each.
+        """
+        unique = list(dict.fromkeys(descriptions))
+        if not os.environ.get('GEMINI_API_KEY'):
+            # Keyword heuristic only: warn once for the batch (not per
+            # ticket) and run it straight over the unique descriptions
+            logger.warning('GEMINI_API_KEY not set — using keyword heuristic')
+            results = dict(zip(unique, map(LLMService._keyword_fallback, unique)))
+        elif len(unique) <= 1:
+            results = dict(zip(unique, map(LLMService.classify, unique)))
+        else:
+            results = dict(zip(unique, _batch_pool.map(LLMService.classify, unique)))
+        return [dict(results[d]) for d in descriptions]
+
+    @staticmethod
+    def _call_gemini(api_key: str, description: str, signals: dict | None = None) -> dict:
         """
         Make the Gemini API call with an optimized prompt.
 
@@ -204,36 +721,20 @@ class LLMService:
           - Pre-extracted signals injected as structured hints
           - Few-shot examples in the prompt
           - Temperature 0.05 for near-deterministic classification
-          - Max 150 tokens (allows brief reasoning + JSON)
+          - JSON mode with a response schema — the model can only emit the
+            two labels, so MAX_OUTPUT_TOKENS (32) is plenty
         """
-        import google.generativeai as genai
+        if signals is None:
+            signals = _scan_signals(description)
 
-        genai.configure(api_key=api_key)
-
-        model = genai.GenerativeModel('gemini-1.5-flash')
+        # Configured once per API key and prompt variant — preamble and
+        # generation settings included (see _gemini_model)
+        model = _gemini_model(api_key, _prompt_variant(signals))
 
         # Build the optimized prompt with signal extraction
-        signals = _extract_signals(description)
-        signal_block = f"\n### Extracted Signals:\n{signals}\n" if signals else ""
-
-        prompt = (
-            CLASSIFICATION_PROMPT
-            + signal_block
-            + f"### Ticket Description:\n{description}\n\n"
-            + "### Your Analysis and Output:\n"
-        )
-
-        generation_config = genai.types.GenerationConfig(
-            temperature=0.05,       # Near-deterministic for consistent results
-            max_output_tokens=200,   # Room for brief reasoning + JSON
-            top_p=0.9,              # Focused sampling
-        )
+        prompt = _build_prompt(description, signals)
 
-        response = model.generate_content(
-            prompt,
-            generation_config=generation_config,
-            request_options={'timeout': 10},
-        )
+        response = model.generate_content(prompt, request_options=_REQUEST_OPTIONS)
 
         return LLMService._parse_response(response.text)
 
@@ -243,41 +744,63 @@ class LLMService:
         Parse and validate the LLM response.
 
         Handles:
-          - Clean JSON
+          - Clean JSON (the normal case under JSON mode)
           - JSON wrapped in markdown code blocks
           - JSON embedded in reasoning text
           - Invalid/missing fields
         """
-        text = response_text.strip()
+        text = response_text[:_MAX_RESPONSE_CHARS].strip()
+
+        # Bare JSON object — parse it directly, no regex pass needed
+        if text.startswith('{') and '```' not in text:
+            try:
+                return LLMService._validate_labels(orjson.loads(text))
+            except orjson.JSONDecodeError:
+                pass
 
         # Strip markdown code block if present
-        if '```' in text:
-            # Extract content between code fences
-            match = re.search(r'```(?:json)?\s*\n?(.*?)\n?\s*```', text, re.DOTALL)
-            if match:
-                text = match.group(1).strip()
+        start = text.find('```')
+        if start != -1:
+            # Extract content between code fences (optional `json` tag)
+            end = text.find('```', start + 3)
+            if end != -1:
+                inner = text[start + 3:end]
+                if inner.startswith('json'):
+                    inner = inner[4:]
+                text = inner.strip()
 
         # Try to find JSON object in the text (handles reasoning + JSON output)
-        json_match = re.search(r'\{[^{}]*"suggested_category"[^{}]*\}', text)
+        json_match = _JSON_OBJECT.search(text)
         if json_match:
             text = json_match.group(0)
 
         try:
-            result = json.loads(text)
-        except json.JSONDecodeError:
-            logger.warning(f'LLM returned non-JSON response: {response_text[:200]}')
+            result = orjson.loads(text)
+        except orjson.JSONDecodeError:
+            logger.warning('LLM returned non-JSON response: %.200s', response_text)
             return {**DEFAULT_RESPONSE, 'warning': 'LLM returned invalid format'}
 
-        # Validate the parsed values against allowed choices
-        category = result.get('suggested_category', '').lower().strip()
-        priority = result.get('suggested_priority', '').lower().strip()
+        return LLMService._validate_labels(result)
+
+    @staticmethod
+    def _validate_labels(result: dict) -> dict:
+        """Validate parsed labels against the allowed choices."""
+        category = result.get('suggested_category', '')
+        priority = result.get('suggested_priority', '')
+
+        # Schema-constrained answers are already canonical — only normalize
+        # (and allocate new strings) for values that miss the fast check
+        if category not in VALID_CATEGORIES:
+            category = category.lower().strip()
+        if priority not in VALID_PRIORITIES:
+            priority = priority.lower().strip()
 
         if category not in VALID_CATEGORIES:
-            logger.warning(f'LLM returned invalid category: {category}')
+            logger.warning('LLM returned invalid category: %s', category)
             category = 'general'
 
         if priority not in VALID_PRIORITIES:
-            logger.warning(f'LLM returned invalid priority: {priority}')
+            logger.warning('LLM returned invalid priority: %s', priority)
             priority = 'medium'
 
         return {
@@ -286,7 +809,7 @@ class LLMService:
         }
 
     @staticmethod
-    def _keyword_fallback(description: str) -> dict:
+    def _keyword_fallback(description: str, signals: dict | None = None) -> dict:
         """
         Keyword-based heuristic classification.
 
@@ -295,15 +818,17 @@ class LLMService:
           - LLM API call fails
 
         This is MUCH better than returning generic "general/medium" defaults
-        because it actually analyzes the description text.
+        because it actually analyzes the description text. `signals` is
+        reused from classify() when the Gemini path already scanned it.
         """
-        desc_lower = description.lower()
+        # Every pattern is case-insensitive — no lowercased copy of the text
+        if signals is None:
+            signals = _scan_signals(description)
 
         # ── Determine category by keyword density ──
         scores = {cat: 0 for cat in VALID_CATEGORIES}
-        for cat, pattern in CATEGORY_SIGNALS.items():
-            matches = pattern.findall(desc_lower)
-            scores[cat] = len(matches)
+        for cat in CATEGORY_SIGNALS:
+            scores[cat] = len(signals[cat])
 
         # Pick highest-scoring category, default to 'general'
         best_category = max(scores, key=scores.get)
@@ -311,21 +836,15 @@ class LLMService:
             best_category = 'general'
 
         # ── Determine priority by urgency signals ──
-        urgency_matches = URGENCY_KEYWORDS.findall(desc_lower)
-        urgency_count = len(urgency_matches)
-
-        # Check for extreme urgency words
-        extreme = re.search(
-            r'\b(die|death|life.?threatening|emergency|production.?down|'
-            r'data.?loss|security.?breach|outage)\b',
-            desc_lower,
-        )
+        urgency_count = len(signals['urgency'])
 
-        if extreme or urgency_count >= 3:
+        # Extreme urgency words / broken-feature cues — each extra pass only
+        # runs when the urgency count has not already settled the priority
+        if urgency_count >= 3 or EXTREME_URGENCY_KEYWORDS.search(description):
             best_priority = 'critical'
         elif urgency_count >= 1:
             best_priority = 'high'
-        elif re.search(r'\b(not.?working|broken|fail|crash|error|cannot|can\'t|won\'t)\b', desc_lower):
+        elif BROKEN_KEYWORDS.search(description):
             best_priority = 'high'
         elif scores.get('general', 0) > 0 and best_category == 'general':
             best_priority = 'low'
@@ -0,0 +1,66 @@
+"""
+Signal receivers for the tickets app.
+
+invalidate_ticket_caches — after any ticket write commits, starts a new
+    generation, orphaning the cached /stats/ response and list COUNT(*)s
+invalidate_ticket_caches_on_commit — the same coalesced flush, for writes
+    that send no model signals
+
+post_save/post_delete only fire for Model.save()/delete() and queryset
+delete(). QuerySet.bulk_create() and update() (and so bulk_update()) send
+no signals; Ticket's TicketQuerySet calls invalidate_ticket_caches_on_commit()
+for them. Raw SQL writes are not seen at all and stay stale until
+STATS_CACHE_TIMEOUT / LIST_COUNT_CACHE_TIMEOUT expire.
+
+Entries are tagged with the generation read before they were computed
+(pagination.get_or_set_for_generation), so a request that aggregated
+pre-write rows but stores its result after the flush cannot re-cache
+stale data under the new generation.
+"""
+
+import functools
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Ticket
+from .pagination import GENERATION_KEY, new_generation
+
+STATS_CACHE_KEY = 'tickets:stats:v2'
+
+
+def _flush_ticket_caches(connection):
+    """Every create, update or delete can change the aggregates and counts."""
+    connection._ticket_caches_queue = None
+    # A fresh token invalidates /stats/ and the count of every filter combination
+    cache.set(GENERATION_KEY, new_generation(), timeout=None)
+
+
+def invalidate_ticket_caches_on_commit(using: str = DEFAULT_DB_ALIAS) -> None:
+    """
+    Schedule one cache flush per transaction, however many rows it writes.
+
+    Running on commit also keeps a concurrent request from re-caching the
+    pre-write data between the invalidation and the commit. Outside a
+    transaction the flush runs immediately. Django replaces the connection's
+    run_on_commit list whenever it commits or rolls back (fully or to a
+    savepoint), so "our flush is queued" is tracked by list identity, and
+    a rolled-back flush is rescheduled by the next write.
+    """
+    connection = connections[using]
+    if not connection.in_atomic_block:
+        _flush_ticket_caches(connection)
+        return
+    if getattr(connection, '_ticket_caches_queue', None) is connection.run_on_commit:
+        return
+    transaction.on_commit(functools.partial(_flush_ticket_caches, connection), using=using)
+    connection._ticket_caches_queue = connection.run_on_commit
+
+
+@receiver(post_save, sender=Ticket, dispatch_uid='tickets_caches_on_save')
+@receiver(post_delete, sender=Ticket, dispatch_uid='tickets_caches_on_delete')
+def invalidate_ticket_caches(sender, using, **kwargs):
+    """A single ticket was saved or deleted — flush once its transaction commits."""
+    invalidate_ticket_caches_on_commit(using)
@@ -8,11 +8,29 @@ Covers:
   - Signal extraction
 """
 
+import contextlib
+import tempfile
+import threading
 from unittest.mock import MagicMock, patch
 
-from django.test import TestCase
-
-from tickets.services.llm_service import LLMService, _extract_signals
+from django.test import TestCase, override_settings
+
+from tickets.services.llm_service import (
+    CLASSIFICATION_PROMPT,
+    LLMService,
+    RESPONSE_SCHEMA,
+    _BATCH_CONCURRENCY,
+    _SHADOW_MAX_PENDING,
+    _SYSTEM_PROMPTS,
+    _configure,
+    _extract_signals,
+    _gemini_model,
+    _result_cache,
+    _scan_signals,
+    _shadow_pool,
+    set_shared_cache,
+    warm_up,
+)
 
 
 class LLMServiceParseTest(TestCase):
@@ -65,6 +83,19 @@ class LLMServiceParseTest(TestCase):
         self.assertEqual(result['suggested_category'], 'billing')
         self.assertEqual(result['suggested_priority'], 'medium')
 
+    def test_parse_normalizes_case_and_whitespace(self):
+        """Labels that differ only in case/whitespace should still validate."""
+        response_text = '{"suggested_category": " Billing ", "suggested_priority": "HIGH"}'
+        result = LLMService._parse_response(response_text)
+        self.assertEqual(result['suggested_category'], 'billing')
+        self.assertEqual(result['suggested_priority'], 'high')
+
+    def test_parse_oversized_response_is_bounded(self):
+        """Runaway output should be rejected without scanning all of it."""
+        response_text = '{"suggested_category": ' + 'x' * 1_000_000 + '}'
+        result = LLMService._parse_response(response_text)
+        self.assertEqual(result['warning'], 'LLM returned invalid format')
+
 
 class LLMServiceKeywordFallbackTest(TestCase):
     """Test keyword-based heuristic classification (fallback)."""
@@ -131,15 +162,57 @@ class LLMServiceSignalExtractionTest(TestCase):
         signals = _extract_signals('I was charged twice for an invoice payment')
         self.assertIn('BILLING', signals)
 
+    def test_signal_keywords_deduplicated_in_order(self):
+        """Repeated keywords should be listed once, in first-seen order."""
+        signals = _extract_signals('Refund the PAYMENT. Payment failed, refund please')
+        self.assertIn('BILLING keywords: refund, payment', signals)
+
     def test_no_signals_returns_empty(self):
         """Should return empty string when no keywords match."""
         signals = _extract_signals('Hello there, I have a question')
         self.assertEqual(signals, '')
 
+    def test_scan_buckets_matches_by_family(self):
+        """A single scan should bucket every keyword under its own family."""
+        signals = _scan_signals('URGENT: refund my payment, the app keeps crashing on login')
+        self.assertEqual(signals['urgency'], ['URGENT'])
+        self.assertEqual(signals['billing'], ['refund', 'payment'])
+        self.assertEqual(signals['technical'], ['app'])
+        self.assertEqual(signals['account'], ['login'])
+
+    def test_scan_without_hyperscan_matches_accelerated_scan(self):
+        """The stdlib `re` scanner should agree with the Hyperscan path."""
+        text = 'Production down! Refund the invoice, 2FA login broken, deadline today'
+        expected = _scan_signals(text)
+        with patch('tickets.services.llm_service._HS_SIGNALS', None):
+            self.assertEqual(_scan_signals(text), expected)
+
 
 class LLMServiceClassifyTest(TestCase):
     """Test the classify() orchestrator method."""
 
+    def setUp(self):
+        _result_cache.clear()
+        self.addCleanup(_result_cache.clear)
+
+    @contextlib.contextmanager
+    def _capture_shadow_futures(self):
+        """Collect the futures of shadow checks submitted inside the block."""
+        futures = []
+        submit = _shadow_pool.submit
+
+        def capture(*args, **kwargs):
+            futures.append(submit(*args, **kwargs))
+            return futures[-1]
+
+        with patch.object(_shadow_pool, 'submit', side_effect=capture):
+            yield futures
+
+    def _reset_gemini_client(self):
+        for cached in (_configure, _gemini_model):
+            cached.cache_clear()
+            self.addCleanup(cached.cache_clear)
+
     def test_classify_without_api_key_uses_fallback(self):
         """Should use keyword fallback when API key is missing."""
         with patch.dict('os.environ', {'GEMINI_API_KEY': ''}):
@@ -159,6 +232,19 @@ class LLMServiceClassifyTest(TestCase):
         self.assertIn(result['suggested_priority'], {'high', 'critical'})
         self.assertIn('warning', result)
 
+    @patch('tickets.services.llm_service._genai')
+    def test_classify_scans_description_once_on_fallback(self, mock_genai):
+        """Prompt signals and the fallback should share a single keyword scan."""
+        self._reset_gemini_client()
+        model = mock_genai.return_value.GenerativeModel.return_value
+        model.generate_content.side_effect = Exception('API connection timeout')
+        with patch.dict('os.environ', {'GEMINI_API_KEY': 'test-key'}), \
+                patch('tickets.services.llm_service._scan_signals', wraps=_scan_signals) as scan:
+            result = LLMService.classify('Payment failed and the app crashes, urgent')
+        scan.assert_called_once()
+        self.assertIn('warning', result)
+        self.assertIn(result['suggested_priority'], {'high', 'critical'})
+
     @patch('tickets.services.llm_service.LLMService._call_gemini')
     def test_classify_returns_gemini_result_on_success(self, mock_call):
         """Should return Gemini's result when API call succeeds."""
@@ -170,3 +256,338 @@ class LLMServiceClassifyTest(TestCase):
             result = LLMService.classify('Double charge on my credit card')
         self.assertEqual(result['suggested_category'], 'billing')
         self.assertEqual(result['suggested_priority'], 'medium')
+
+    @patch('tickets.services.llm_service.LLMService._call_gemini')
+    def test_classify_caches_repeated_descriptions(self, mock_call):
+        """Repeats (modulo case/whitespace/punctuation) should skip the Gemini call."""
+        mock_call.return_value = {
+            'suggested_category': 'billing',
+            'suggested_priority': 'high',
+        }
+        with patch.dict('os.environ', {'GEMINI_API_KEY': 'test-key'}):
+            first = LLMService.classify('Refund my  double charge')
+            second = LLMService.classify('refund my double charge\n')
+            third = LLMService.classify('Refund my double-charge!!')
+        self.assertEqual(first, second)
+        self.assertEqual(first, third)
+        self.assertEqual(mock_call.call_count, 1)
+
+    @patch('tickets.services.llm_service.LLMService._call_gemini')
+    def test_shared_cache_serves_other_workers(self, mock_call):
+        """An answer another worker stored in the shared cache skips Gemini."""
+        shared = {}
+        backend = MagicMock()
+        backend.get.side_effect = shared.get
+        backend.set.side_effect = lambda key, value, timeout: shared.__setitem__(key, value)
+        set_shared_cache(backend, 3600)
+        self.addCleanup(set_shared_cache, None, None)
+        mock_call.return_value = {'suggested_category': 'billing', 'suggested_priority': 'high'}
+
+        with patch.dict('os.environ', {'GEMINI_API_KEY': 'test-key'}):
+            first = LLMService.classify('Refund my double charge')
+            _result_cache.clear()  # a different worker: cold in-process cache
+            second = LLMService.classify('Refund my double charge')
+        self.assertEqual(first, second)
+        self.assertEqual(mock_call.call_count, 1)
+        self.assertEqual(backend.set.call_args.args[2], 3600)
+
+    @patch('tickets.services.llm_service.LLMService._call_gemini')
+    def test_shared_cache_errors_do_not_fail_classify(self, mock_call):
+        """An unreachable shared cache is skipped, not surfaced."""
+        backend = MagicMock()
+        backend.get.side_effect = ConnectionError('redis down')
+        backend.set.side_effect = ConnectionError('redis down')
+        set_shared_cache(backend, 3600)
+        self.addCleanup(set_shared_cache, None, None)
+        mock_call.return_value = {'suggested_category': 'billing', 'suggested_priority': 'high'}
+
+        with patch.dict('os.environ', {'GEMINI_API_KEY': 'test-key'}):
+            result = LLMService.classify('Refund my double charge')
+        self.assertEqual(result['suggested_category'], 'billing')
+
+    @patch('tickets.services.llm_service.LLMService._call_gemini')
+    def test_batch_workers_share_one_cache_backend(self, mock_call):
+        """classify_batch threads must all hit the one configured shared backend."""
+        from django.apps import apps
+        from django.core.cache.backends.filebased import FileBasedCache
+
+        from tickets.services import llm_service
+
+        mock_call.return_value = {'suggested_category': 'billing', 'suggested_priority': 'high'}
+        location = self.enterContext(tempfile.TemporaryDirectory())
+        shared = {'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location,
+        }}
+        with override_settings(CACHES=shared):
+            apps.get_app_config('tickets').ready()
+        self.addCleanup(set_shared_cache, None, None)
+        backend = llm_service._shared_cache
+        self.assertIsInstance(backend, FileBasedCache)
+
+        seen = []
+        both_inside = threading.Barrier(2, timeout=5)
+        real_get = FileBasedCache.get
+
+        def get(cache, key, default=None, version=None):
+            seen.append((threading.get_ident(), cache))
+            both_inside.wait()  # two workers in the shared tier at once
+            return real_get(cache, key, default, version)
+
+        with patch.object(FileBasedCache, 'get', get), \
+                patch.dict('os.environ', {'GEMINI_API_KEY': 'test-key'}):
+            LLMService.classify_batch(['Refund my double charge', 'Charged twice this month'])
+        self.assertEqual(len({thread for thread, _ in seen}), 2)
+        self.assertTrue(all(cache is backend for _, cache in seen))
+
+    @patch('tickets.services.llm_service.LLMService._call_gemini')
+    def test_concurrent_duplicates_share_one_gemini_call(self, mock_call):
+        """A description already being classified should wait for that call."""
+        started, release = threading.Event(), threading.Event()
+
+        def slow_call(*args):
+            started.set()
+            release.wait(5)
+            # Uncached answer — a late second request would call again
+            return {'suggested_category': 'billing', 'suggested_priority': 'low', 'warning': 'x'}
+
+        mock_call.side_effect = slow_call
+        results = []
+        description = 'Invoice shows the wrong amount'
+        with patch.dict('os.environ', {'GEMINI_API_KEY': 'test-key'}):
+            leader = threading.Thread(target=lambda: results.append(LLMService.classify(description)))
+            leader.start()
+            started.wait(5)
+            follower = threading.Thread(target=lambda: results.append(LLMService.classify(description)))
+            follower.start()
+            follower.join(0.2)
+            self.assertTrue(follower.is_alive())
+            release.set()
+            leader.join(5)
+            follower.join(5)
+        self.assertEqual(mock_call.call_count, 1)
+        self.assertEqual(results[0], results[1])
+
+    @patch('tickets.services.llm_service.LLMService._call_gemini')
+    def test_classify_cache_respects_word_order(self, mock_call):
+        """Different word order is a different ticket, not a cache hit."""
+        mock_call.return_value = {
+            'suggested_category': 'billing',
+            'suggested_priority': 'low',
+        }
+        with patch.dict('os.environ', {'GEMINI_API_KEY': 'test-key'}):
+            LLMService.classify('billing issue, not a login problem')
+            LLMService.classify('login issue, not a billing problem')
+        self.assertEqual(mock_call.call_count, 2)
+
+    @patch('tickets.services.llm_service.LLMService._call_gemini')
+    def test_classify_does_not_cache_failed_results(self, mock_call):
+        """Results carrying a warning should be retried, not served from cache."""
+        mock_call.return_value = {
+            'suggested_category': 'general',
+            'suggested_priority': 'medium',
+            'warning': 'LLM returned invalid format',
+        }
+        with patch.dict('os.environ', {'GEMINI_API_KEY': 'test-key'}):
+            LLMService.classify('Something odd happened')
+            LLMService.classify('Something odd happened')
+        self.assertEqual(mock_call.call_count, 2)
+
+    @patch('tickets.services.llm_service.LLMService._call_gemini')
+    def test_classify_batch_dedupes_and_keeps_order(self, mock_call):
+        """Duplicates should be classified once; results follow input order."""
+        answers = {
+            'Refund my invoice': ('billing', 'medium'),
+            'App crashes on start': ('technical', 'high'),
+        }
+
+        def fake_call(api_key, description, signals=None):
+            category, priority = answers[description]
+            return {'suggested_category': category, 'suggested_priority': priority}
+
+        mock_call.side_effect = fake_call
+        batch = ['Refund my invoice', 'App crashes on start', 'Refund my invoice']
+        with patch.dict('os.environ', {'GEMINI_API_KEY': 'test-key'}):
+            results = LLMService.classify_batch(batch)
+        self.assertEqual(
+            [r['suggested_category'] for r in results],
+            ['billing', 'technical', 'billing'],
+        )
+        self.assertEqual(mock_call.call_count, 2)
+        self.assertIsNot(results[0], results[2])
+
+    @patch('tickets.services.llm_service.LLMService._call_gemini')
+    def test_concurrent_batches_share_one_bounded_pool(self, mock_call):
+        """Batches on different request threads must not each add threads."""
+        callers = set()
+
+        def fake_call(api_key, description, signals=None):
+            callers.add(threading.current_thread().name)
+            return {'suggested_category': 'general', 'suggested_priority': 'low'}
+
+        mock_call.side_effect = fake_call
+        with patch.dict('os.environ', {'GEMINI_API_KEY': 'test-key'}):
+            requests = [
+                threading.Thread(target=LLMService.classify_batch, args=(
+                    [f'Something odd happened ({n}.{i})' for i in range(_BATCH_CONCURRENCY)],
+                ))
+                for n in range(3)
+            ]
+            for thread in requests:
+                thread.start()
+            for thread in requests:
+                thread.join()
+        self.assertEqual(mock_call.call_count, 3 * _BATCH_CONCURRENCY)
+        self.assertLessEqual(len(callers), _BATCH_CONCURRENCY)
+        self.assertTrue(all(name.startswith('llm-batch') for name in callers))
+
+    def test_classify_batch_without_api_key_uses_fallback(self):
+        """Without a key every entry should get a keyword classification."""
+        with patch.dict('os.environ', {'GEMINI_API_KEY': ''}), \
+                self.assertLogs('tickets', level='WARNING') as logs:
+            results = LLMService.classify_batch(['I cannot log in to my account', 'Refund my payment'])
+        self.assertEqual([r['suggested_category'] for r in results], ['account', 'billing'])
+        self.assertEqual(len(logs.output), 1)
+
+    @patch('tickets.services.llm_service._SHADOW_SAMPLE_RATE', 0)
+    @patch('tickets.services.llm_service.LLMService._call_gemini')
+    def test_classify_short_circuits_decisive_signals(self, mock_call):
+        """Overwhelming keyword evidence should be answered without Gemini."""
+        with patch.dict('os.environ', {'GEMINI_API_KEY': 'test-key'}):
+            result = LLMService.classify(
+                'URGENT: payment failed, invoice shows a double charge and my refund is missing. Emergency!'
+            )
+        mock_call.assert_not_called()
+        self.assertEqual(result['suggested_category'], 'billing')
+        self.assertEqual(result['suggested_priority'], 'critical')
+        self.assertEqual(result['source'], 'heuristic')
+
+    @patch('tickets.services.llm_service._SHADOW_SAMPLE_RATE', 1)
+    @patch('tickets.services.llm_service.LLMService._call_gemini')
+    def test_shadow_check_logs_disagreement(self, mock_call):
+        """Sampled shortcuts are re-checked by Gemini; the heuristic answer still wins."""
+        mock_call.return_value = {
+            'suggested_category': 'technical',
+            'suggested_priority': 'critical',
+        }
+        with patch.dict('os.environ', {'GEMINI_API_KEY': 'test-key'}), \
+                self.assertLogs('tickets', level='INFO') as logs, \
+                self._capture_shadow_futures() as futures:
+            result = LLMService.classify(
+                'URGENT: payment failed, invoice shows a double charge and my refund is missing. Emergency!'
+            )
+            futures[0].result(5)
+        mock_call.assert_called_once()
+        self.assertEqual(result['suggested_category'], 'billing')
+        self.assertTrue(any('disagreement' in line for line in logs.output))
+
+    @patch('tickets.services.llm_service._SHADOW_SAMPLE_RATE', 1)
+    @patch('tickets.services.llm_service.LLMService._call_gemini')
+    def test_shadow_check_does_not_block_request(self, mock_call):
+        """A sampled shortcut returns before the shadow Gemini call finishes."""
+        release = threading.Event()
+
+        def slow_call(*args):
+            release.wait(5)
+            raise TimeoutError('shadow call timed out')
+
+        mock_call.side_effect = slow_call
+        with patch.dict('os.environ', {'GEMINI_API_KEY': 'test-key'}), \
+                self._capture_shadow_futures() as futures:
+            result = LLMService.classify(
+                'URGENT: payment failed, invoice shows a double charge and my refund is missing. Emergency!'
+            )
+            self.assertEqual(result['source'], 'heuristic')
+            self.assertFalse(futures[0].done())
+            release.set()
+            # The failure is logged inside the shadow task, never raised
+            self.assertIsNone(futures[0].result(5))
+
+    @patch('tickets.services.llm_service._SHADOW_SAMPLE_RATE', 1)
+    def test_failed_shadow_submit_releases_its_slot(self):
+        """A pool that refuses work must not leak pending-check slots."""
+        with patch.dict('os.environ', {'GEMINI_API_KEY': 'test-key'}), \
+                patch.object(_shadow_pool, 'submit', side_effect=RuntimeError('shut down')) as submit:
+            for _ in range(_SHADOW_MAX_PENDING + 1):
+                _result_cache.clear()
+                result = LLMService.classify(
+                    'URGENT: payment failed, invoice shows a double charge and my refund is missing. Emergency!'
+                )
+                self.assertEqual(result['source'], 'heuristic')
+        # Every attempt found a free slot, so none were leaked
+        self.assertEqual(submit.call_count, _SHADOW_MAX_PENDING + 1)
+
+    @patch('tickets.services.llm_service._genai')
+    def test_gemini_client_built_once_per_key(self, mock_genai):
+        """Repeated calls should reuse one configured Gemini model."""
+        self._reset_gemini_client()
+        model = mock_genai.return_value.GenerativeModel.return_value
+        model.generate_content.return_value = MagicMock(
+            text='{"suggested_category": "billing", "suggested_priority": "low"}',
+        )
+        for _ in range(3):
+            result = LLMService._call_gemini('test-key', 'Refund my last invoice please')
+        self.assertEqual(result['suggested_category'], 'billing')
+        mock_genai.return_value.configure.assert_called_once_with(
+            api_key='test-key', transport='grpc',
+        )
+        self.assertEqual(mock_genai.return_value.GenerativeModel.call_count, 1)
+        self.assertEqual(model.generate_content.call_count, 3)
+
+    @patch('tickets.services.llm_service._genai')
+    def test_static_prompt_sent_as_system_instruction(self, mock_genai):
+        """The preamble should be set on the model, not repeated per request."""
+        self._reset_gemini_client()
+        model = mock_genai.return_value.GenerativeModel.return_value
+        model.generate_content.return_value = MagicMock(
+            text='{"suggested_category": "account", "suggested_priority": "high"}',
+        )
+        LLMService._call_gemini('test-key', 'Something odd happened, please advise')
+        _, kwargs = mock_genai.return_value.GenerativeModel.call_args
+        self.assertEqual(kwargs['system_instruction'], CLASSIFICATION_PROMPT)
+        prompt = model.generate_content.call_args[0][0]
+        self.assertNotIn(CLASSIFICATION_PROMPT, prompt)
+        self.assertIn('Something odd happened, please advise', prompt)
+
+    @patch('tickets.services.llm_service._genai')
+    def test_dominant_category_uses_specialized_prompt(self, mock_genai):
+        """Clear single-category tickets should get the shorter prompt variant."""
+        self._reset_gemini_client()
+        model = mock_genai.return_value.GenerativeModel.return_value
+        model.generate_content.return_value = MagicMock(
+            text='{"suggested_category": "account", "suggested_priority": "high"}',
+        )
+        LLMService._call_gemini('test-key', 'I cannot login to my account')
+        _, kwargs = mock_genai.return_value.GenerativeModel.call_args
+        self.assertEqual(kwargs['system_instruction'], _SYSTEM_PROMPTS['account'])
+        self.assertLess(len(kwargs['system_instruction']), len(CLASSIFICATION_PROMPT))
+        self.assertNotIn('charged twice', kwargs['system_instruction'])
+
+        LLMService._call_gemini('test-key', 'Urgent: I cannot login to my account')
+        _, kwargs = mock_genai.return_value.GenerativeModel.call_args
+        self.assertEqual(kwargs['system_instruction'], CLASSIFICATION_PROMPT)
+        mock_genai.return_value.configure.assert_called_once()
+
+    @patch('tickets.services.llm_service._genai')
+    def test_gemini_call_uses_json_mode(self, mock_genai):
+        """The request should ask for schema-constrained JSON output."""
+        self._reset_gemini_client()
+        model = mock_genai.return_value.GenerativeModel.return_value
+        model.generate_content.return_value = MagicMock(
+            text='{"suggested_category": "technical", "suggested_priority": "high"}',
+        )
+        LLMService._call_gemini('test-key', 'The app crashes on start')
+        _, kwargs = mock_genai.return_value.types.GenerationConfig.call_args
+        self.assertEqual(kwargs['response_mime_type'], 'application/json')
+        self.assertEqual(kwargs['response_schema'], RESPONSE_SCHEMA)
+
+    @patch('tickets.services.llm_service._genai')
+    def test_warm_up_imports_sdk_only_with_api_key(self, mock_genai):
+        """Pre-fork warm-up should import the SDK but never build a client."""
+        with patch.dict('os.environ', {'GEMINI_API_KEY': ''}):
+            warm_up()
+        mock_genai.assert_not_called()
+
+        with patch.dict('os.environ', {'GEMINI_API_KEY': 'test-key'}):
+            warm_up()
+        mock_genai.assert_called_once_with()
+        mock_genai.return_value.configure.assert_not_called()
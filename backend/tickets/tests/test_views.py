@@ -2,16 +2,22 @@
 Tests for the Ticket API views.
 """
 
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import transaction
 from django.test import TestCase
 from rest_framework.test import APIClient
 
 from tickets.models import Ticket
+from tickets.serializers import TicketSerializer
 
 
 class TicketAPITest(TestCase):
     """Test the ticket CRUD API endpoints."""
 
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.ticket_data = {
             'title': 'Test ticket',
@@ -27,6 +33,13 @@ class TicketAPITest(TestCase):
         self.assertEqual(response.data['title'], 'Test ticket')
         self.assertEqual(response.data['status'], 'open')
 
+    def test_serializer_fields_bound_per_instance(self):
+        """Cached field prototypes must still give each serializer its own bound fields."""
+        first, second = TicketSerializer(), TicketSerializer()
+        self.assertIsNot(first.fields['title'], second.fields['title'])
+        self.assertIs(first.fields['title'].parent, first)
+        self.assertIs(second.fields['title'].parent, second)
+
     def test_create_ticket_missing_title_returns_400(self):
         """POST /api/tickets/ without title should return 400."""
         data = {**self.ticket_data}
@@ -34,6 +47,20 @@ class TicketAPITest(TestCase):
         response = self.client.post('/api/tickets/', data, format='json')
         self.assertEqual(response.status_code, 400)
 
+    def test_create_ticket_malformed_json_returns_400(self):
+        """POST /api/tickets/ with an unparseable JSON body should return 400."""
+        response = self.client.post(
+            '/api/tickets/', '{"title": "x",', content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_response_is_utf8_json(self):
+        """Non-ASCII fields should round-trip through the JSON renderer."""
+        data = {**self.ticket_data, 'title': 'Paiement refusé — 支付失败'}
+        response = self.client.post('/api/tickets/', data, format='json')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json()['title'], 'Paiement refusé — 支付失败')
+
     def test_list_tickets_newest_first(self):
         """GET /api/tickets/ should return tickets newest first."""
         Ticket.objects.create(title='First', description='Desc 1')
@@ -43,19 +70,52 @@ class TicketAPITest(TestCase):
         results = response.data['results']
         self.assertEqual(results[0]['title'], 'Second')
 
+    def test_list_returns_description_preview(self):
+        """List rows should carry a truncated preview, not the full description."""
+        Ticket.objects.create(title='Long', description='x' * 500)
+        Ticket.objects.create(title='Short', description='Brief description')
+        results = self.client.get('/api/tickets/').data['results']
+        self.assertNotIn('description', results[0])
+        self.assertEqual(results[0]['description_preview'], 'Brief description')
+        self.assertEqual(results[1]['description_preview'], 'x' * 120 + '...')
+
+    def test_list_created_at_matches_detail_format(self):
+        """List rows encode created_at exactly as the full serializer does."""
+        ticket = Ticket.objects.create(title='T1', description='D1')
+        row = self.client.get('/api/tickets/').json()['results'][0]
+        detail = self.client.get(f'/api/tickets/{ticket.id}/').json()
+        self.assertEqual(row['created_at'], detail['created_at'])
+        self.assertTrue(row['created_at'].endswith('Z'))
+
     def test_filter_by_category(self):
         """GET /api/tickets/?category=billing should filter correctly."""
-        Ticket.objects.create(title='T1', description='D1', category='billing')
-        Ticket.objects.create(title='T2', description='D2', category='technical')
+        Ticket.objects.bulk_create([
+            Ticket(title='T1', description='D1', category='billing'),
+            Ticket(title='T2', description='D2', category='technical'),
+        ])
         response = self.client.get('/api/tickets/?category=billing')
         results = response.data['results']
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0]['category'], 'billing')
 
+    def test_filter_invalid_choice_returns_400(self):
+        """An unknown filter value should be rejected, not ignored."""
+        response = self.client.get('/api/tickets/?category=nonsense')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('category', response.json()['details'])
+
+    def test_retrieve_ignores_list_filters(self):
+        """Filters narrow the list only — a ticket is always reachable by id."""
+        ticket = Ticket.objects.create(title='T1', description='D1', category='billing')
+        response = self.client.get(f'/api/tickets/{ticket.id}/?category=technical')
+        self.assertEqual(response.status_code, 200)
+
     def test_search_by_title(self):
         """GET /api/tickets/?search=login should search title."""
-        Ticket.objects.create(title='Login issue', description='Cannot log in')
-        Ticket.objects.create(title='Billing problem', description='Overcharged')
+        Ticket.objects.bulk_create([
+            Ticket(title='Login issue', description='Cannot log in'),
+            Ticket(title='Billing problem', description='Overcharged'),
+        ])
         response = self.client.get('/api/tickets/?search=login')
         results = response.data['results']
         self.assertEqual(len(results), 1)
@@ -71,11 +131,69 @@ class TicketAPITest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data['status'], 'in_progress')
 
+    def test_patch_updates_only_submitted_columns(self):
+        """PATCH should be one SELECT plus a narrow UPDATE, and return the full ticket."""
+        ticket = Ticket.objects.create(title='T1', description='D1')
+        with self.assertNumQueries(2) as ctx:
+            response = self.client.patch(
+                f'/api/tickets/{ticket.id}/',
+                {'priority': 'high'},
+                format='json',
+            )
+        self.assertEqual(response.data['priority'], 'high')
+        self.assertEqual(response.data['description'], 'D1')
+        update_sql = ctx.captured_queries[1]['sql']
+        self.assertIn('UPDATE', update_sql)
+        self.assertNotIn('description', update_sql)
+
+    def test_patch_response_matches_full_serializer(self):
+        """PATCH should answer with exactly the TicketSerializer representation."""
+        ticket = Ticket.objects.create(title='T1', description='D1', category='billing')
+        response = self.client.patch(
+            f'/api/tickets/{ticket.id}/', {'status': 'resolved'}, format='json',
+        )
+        ticket.refresh_from_db()
+        self.assertEqual(response.json(), self.client.get(f'/api/tickets/{ticket.id}/').json())
+        self.assertEqual(response.data, TicketSerializer(ticket).data)
+
+    def test_list_count_cached_until_ticket_write(self):
+        """A repeated list request should skip COUNT(*) until a ticket changes."""
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.create(title='T1', description='D1', category='billing')
+        self.client.get('/api/tickets/?category=billing')
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/tickets/?category=billing')
+        self.assertEqual(response.data['count'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.create(title='T2', description='D2', category='billing')
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/tickets/?category=billing')
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_list_query_count_independent_of_rows(self):
+        """A list page is COUNT + page SELECT, however many rows it holds (no N+1)."""
+        Ticket.objects.bulk_create(
+            Ticket(title=f'T{i}', description='D' * 300) for i in range(25)
+        )
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/tickets/')
+        self.assertEqual(len(response.data['results']), 20)
+
+    def test_retrieve_single_query(self):
+        """Retrieving a ticket should be one SELECT."""
+        ticket = Ticket.objects.create(title='T1', description='D1')
+        with self.assertNumQueries(1):
+            self.client.get(f'/api/tickets/{ticket.id}/')
+
     def test_combined_filters(self):
         """Multiple filters should be combined with AND logic."""
-        Ticket.objects.create(title='T1', description='D1', category='billing', priority='high')
-        Ticket.objects.create(title='T2', description='D2', category='billing', priority='low')
-        Ticket.objects.create(title='T3', description='D3', category='technical', priority='high')
+        Ticket.objects.bulk_create([
+            Ticket(title='T1', description='D1', category='billing', priority='high'),
+            Ticket(title='T2', description='D2', category='billing', priority='low'),
+            Ticket(title='T3', description='D3', category='technical', priority='high'),
+        ])
         response = self.client.get('/api/tickets/?category=billing&priority=high')
         results = response.data['results']
         self.assertEqual(len(results), 1)
@@ -87,6 +205,7 @@ class StatsAPITest(TestCase):
 
     def setUp(self):
         self.client = APIClient()
+        cache.clear()
 
     def test_stats_empty_database(self):
         """Stats should return zeros when no tickets exist."""
@@ -97,9 +216,11 @@ class StatsAPITest(TestCase):
 
     def test_stats_with_tickets(self):
         """Stats should aggregate correctly."""
-        Ticket.objects.create(title='T1', description='D1', category='billing', priority='high')
-        Ticket.objects.create(title='T2', description='D2', category='billing', priority='low')
-        Ticket.objects.create(title='T3', description='D3', category='technical', priority='high', status='resolved')
+        Ticket.objects.bulk_create([
+            Ticket(title='T1', description='D1', category='billing', priority='high'),
+            Ticket(title='T2', description='D2', category='billing', priority='low'),
+            Ticket(title='T3', description='D3', category='technical', priority='high', status='resolved'),
+        ])
 
         response = self.client.get('/api/tickets/stats/')
         data = response.data
@@ -108,3 +229,189 @@ class StatsAPITest(TestCase):
         self.assertEqual(data['priority_breakdown']['high'], 2)
         self.assertEqual(data['category_breakdown']['billing'], 2)
         self.assertEqual(data['category_breakdown']['technical'], 1)
+
+    def test_stats_single_query(self):
+        """All statistics should come from one aggregate query."""
+        Ticket.objects.create(title='T1', description='D1', category='account', priority='critical')
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/tickets/stats/')
+        data = response.data
+        self.assertEqual(data['priority_breakdown'], {'low': 0, 'medium': 0, 'high': 0, 'critical': 1})
+        self.assertEqual(data['category_breakdown']['account'], 1)
+        self.assertEqual(data['avg_tickets_per_day'], 1.0)
+
+    def test_stats_cached_until_ticket_write(self):
+        """Repeat reads should hit the cache; any ticket write invalidates it."""
+        self.client.get('/api/tickets/stats/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/tickets/stats/')
+        self.assertEqual(response.data['total_tickets'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket = Ticket.objects.create(title='T1', description='D1')
+        self.assertEqual(self.client.get('/api/tickets/stats/').data['total_tickets'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket.status = 'closed'
+            ticket.save()
+        self.assertEqual(self.client.get('/api/tickets/stats/').data['open_tickets'], 0)
+
+    def test_stats_refreshed_after_bulk_writes(self):
+        """bulk_create() and queryset update() send no signals but must still invalidate."""
+        self.assertEqual(self.client.get('/api/tickets/stats/').data['total_tickets'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.bulk_create([
+                Ticket(title='T1', description='D1'),
+                Ticket(title='T2', description='D2'),
+            ])
+        self.assertEqual(self.client.get('/api/tickets/stats/').data['total_tickets'], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.filter(status='open').update(status='closed')
+        self.assertEqual(self.client.get('/api/tickets/stats/').data['open_tickets'], 0)
+
+    def test_stats_computed_before_a_write_is_not_served_after_it(self):
+        """A result that lands after a concurrent write's flush must not be cached."""
+        from tickets import views
+
+        compute = views._compute_stats
+
+        def compute_then_concurrent_write():
+            stale = compute()
+            # Another request's write commits before this one stores its result
+            with self.captureOnCommitCallbacks(execute=True):
+                Ticket.objects.create(title='T1', description='D1')
+            return stale
+
+        with patch('tickets.views._compute_stats', compute_then_concurrent_write):
+            self.assertEqual(self.client.get('/api/tickets/stats/').data['total_tickets'], 0)
+        self.assertEqual(self.client.get('/api/tickets/stats/').data['total_tickets'], 1)
+
+    def test_cache_invalidation_once_per_transaction(self):
+        """Many writes in one transaction should schedule a single cache flush."""
+        with self.captureOnCommitCallbacks() as callbacks:
+            for i in range(3):
+                Ticket.objects.create(title=f'T{i}', description='D')
+        self.assertEqual(len(callbacks), 1)
+
+    def test_cache_invalidation_rescheduled_after_rollback(self):
+        """A flush dropped by a rolled-back savepoint must not block later ones."""
+        with self.captureOnCommitCallbacks() as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                Ticket.objects.create(title='T1', description='D1')
+                raise RuntimeError
+            Ticket.objects.create(title='T2', description='D2')
+        self.assertEqual(len(callbacks), 1)
+
+
+@patch.dict('os.environ', {'GEMINI_API_KEY': ''})
+class ClassifyAPITest(TestCase):
+    """Test the classify endpoint's request handling (keyword fallback, no API key)."""
+
+    def setUp(self):
+        self.client = APIClient(enforce_csrf_checks=True)
+
+    def test_classify_returns_suggestions(self):
+        """A valid description should return both suggested labels as JSON."""
+        response = self.client.post(
+            '/api/tickets/classify/',
+            {'description': 'I was charged twice for my subscription'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json()['suggested_category'], 'billing')
+        self.assertIn('suggested_priority', response.json())
+
+    def test_classify_touches_no_database(self):
+        """Classification is stateless — it must not query the database."""
+        with self.assertNumQueries(0):
+            self.client.post(
+                '/api/tickets/classify/',
+                {'description': 'I was charged twice for my subscription'},
+                format='json',
+            )
+
+    def test_classify_short_description_returns_400(self):
+        """Descriptions under 10 characters (after trimming) are rejected in the error envelope."""
+        response = self.client.post(
+            '/api/tickets/classify/', {'description': '   short   '}, format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+        body = response.json()
+        self.assertEqual(body['error'], 'Bad Request')
+        self.assertIn('description', body['details'])
+
+    def test_classify_missing_or_malformed_body_returns_400(self):
+        """A missing field or unparseable JSON should be a 400, not a 500."""
+        missing = self.client.post('/api/tickets/classify/', {}, format='json')
+        self.assertEqual(missing.json()['details'], {'description': ['This field is required.']})
+        malformed = self.client.post(
+            '/api/tickets/classify/', '{"description":', content_type='application/json',
+        )
+        self.assertEqual(malformed.status_code, 400)
+
+    def test_classify_empty_body_reports_required_field(self):
+        """An empty body is no data, like DRF — a field error, not a parse error."""
+        for url, field in (('/api/tickets/classify/', 'description'),
+                           ('/api/tickets/classify-batch/', 'descriptions')):
+            response = self.client.post(url, b'', content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json()['details'], {field: ['This field is required.']})
+
+    def test_classify_unsupported_content_type_returns_415(self):
+        """Only JSON and form bodies are accepted."""
+        response = self.client.post(
+            '/api/tickets/classify/', '{"description": "I was charged twice"}',
+            content_type='text/plain',
+        )
+        self.assertEqual(response.status_code, 415)
+        self.assertEqual(response.json()['error'], 'Unsupported Media Type')
+
+    def test_classify_rejects_get(self):
+        """Only POST is allowed."""
+        response = self.client.get('/api/tickets/classify/')
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(response.json()['error'], 'Method Not Allowed')
+
+    @patch('tickets.views.LLMService.classify_batch')
+    def test_classify_batch_returns_results_in_order(self, mock_batch):
+        """The batch endpoint should hand all descriptions to classify_batch at once."""
+        mock_batch.return_value = [
+            {'suggested_category': 'billing', 'suggested_priority': 'low'},
+            {'suggested_category': 'technical', 'suggested_priority': 'high'},
+        ]
+        descriptions = ['Refund my double charge', 'The app crashes on every login']
+        response = self.client.post(
+            '/api/tickets/classify-batch/', {'descriptions': descriptions}, format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        mock_batch.assert_called_once_with(descriptions)
+        self.assertEqual(response.json()['results'], mock_batch.return_value)
+
+    def test_classify_batch_validates_each_description(self):
+        """Invalid items and oversized batches should be rejected with a 400."""
+        response = self.client.post(
+            '/api/tickets/classify-batch/',
+            {'descriptions': ['Refund my double charge', 'short']},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('1', response.json()['details']['descriptions'])
+
+        response = self.client.post(
+            '/api/tickets/classify-batch/',
+            {'descriptions': ['Refund my double charge'] * 33},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_classify_batch_form_without_descriptions_is_required(self):
+        """A form post missing the key should say it is required."""
+        response = self.client.post('/api/tickets/classify-batch/', {'other': 'x'}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()['details']['descriptions'], ['This field is required.'],
+        )
@@ -1,17 +1,20 @@
 """
 URL routing for the tickets app.
 
-Uses DRF's DefaultRouter for the TicketViewSet, with manual
+Uses DRF's SimpleRouter for the TicketViewSet, with manual
 registration for stats and classify endpoints (placed before
-the router catch-all to avoid route conflicts).
+the router catch-all to avoid route conflicts). SimpleRouter rather
+than DefaultRouter: the API root view it adds would be shadowed by the
+list route at the same path anyway, and the `.json` format-suffix
+patterns would double the URL list every request is resolved against.
 """
 
 from django.urls import include, path
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import SimpleRouter
 
 from . import views
 
-router = DefaultRouter()
+router = SimpleRouter()
 router.register(r'', views.TicketViewSet, basename='tickets')
 
 # Stats and classify must be registered BEFORE the router
@@ -19,5 +22,6 @@ router.register(r'', views.TicketViewSet, basename='tickets')
 urlpatterns = [
     path('stats/', views.StatsView.as_view(), name='ticket-stats'),
     path('classify/', views.ClassifyView.as_view(), name='ticket-classify'),
+    path('classify-batch/', views.ClassifyBatchView.as_view(), name='ticket-classify-batch'),
     path('', include(router.urls)),
 ]
@@ -2,27 +2,44 @@
 API views for the Support Ticket System.
 
 TicketViewSet — CRUD operations for tickets (list, create, partial_update)
-StatsView — aggregated ticket statistics (DB-level, no Python loops)
+StatsView — aggregated ticket statistics (DB-level, no Python loops, cached)
 ClassifyView — LLM-based ticket classification
+ClassifyBatchView — LLM-based classification of several descriptions at once
 """
 
 import logging
-from datetime import timedelta
+import operator
 
-from django.db.models import Count, Q
+import orjson
+from django.conf import settings
+from django.db.models import Count, Min, Q
+from django.db.models.functions import Substr
+from django.http import HttpResponse
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from django_filters.utils import translate_validation
 from rest_framework import mixins, status, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import empty
+from rest_framework.filters import OrderingFilter
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .exceptions import get_error_title
 from .filters import TicketFilter
 from .models import Ticket
+from .pagination import TicketPagination, get_or_set_for_generation
 from .serializers import (
+    ClassifyBatchRequestSerializer,
     ClassifyRequestSerializer,
+    TicketListSerializer,
     TicketSerializer,
     TicketUpdateSerializer,
 )
 from .services.llm_service import LLMService
+from .signals import STATS_CACHE_KEY
 
 logger = logging.getLogger('tickets')
 
@@ -46,8 +63,38 @@ class TicketViewSet(
 
     queryset = Ticket.objects.all()
     filterset_class = TicketFilter
+    pagination_class = TicketPagination
+    # TicketFilter is applied directly in filter_queryset() (it also owns
+    # ?search=), so only ?ordering= still goes through a DRF backend.
+    filter_backends = [OrderingFilter]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # Only the columns the list rows render; the description is cut
+            # to a short head in SQL instead of shipping the full TEXT.
+            queryset = queryset.only(
+                'id', 'title', 'category', 'priority', 'status', 'created_at',
+            ).annotate(
+                description_head=Substr(
+                    'description', 1, TicketListSerializer.DESCRIPTION_PREVIEW_LENGTH + 1,
+                ),
+            )
+        return queryset
+
+    def filter_queryset(self, queryset):
+        # Filters only narrow the list — retrieve/PATCH look tickets up by id
+        # alone, without building a FilterSet
+        if self.action == 'list':
+            filterset = self.filterset_class(self.request.query_params, queryset=queryset)
+            if not filterset.is_valid():
+                raise translate_validation(filterset.errors)
+            queryset = filterset.qs
+        return super().filter_queryset(queryset)
 
     def get_serializer_class(self):
+        if self.action == 'list':
+            return TicketListSerializer
         if self.action == 'partial_update':
             return TicketUpdateSerializer
         return TicketSerializer
@@ -58,9 +105,10 @@ class TicketViewSet(
         serializer = self.get_serializer(instance, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        # Refresh from DB and return the full ticket representation
-        instance.refresh_from_db()
-        return Response(TicketSerializer(instance).data)
+        # The instance already holds the saved values (no DB-side defaults
+        # change on update) — no refresh query needed, and the update
+        # serializer renders the full ticket itself
+        return Response(serializer.data)
 
     def create(self, request, *args, **kwargs):
         """Create a new ticket — returns 201 on success."""
@@ -70,12 +118,73 @@ class TicketViewSet(
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+# (choice value, aggregate alias) pairs, resolved once at import so building
+# the breakdowns never iterates the choice enums per request.
+_PRIORITY_ALIASES = tuple((p.value, f'pri_{p.value}') for p in Ticket.Priority)
+_CATEGORY_ALIASES = tuple((c.value, f'cat_{c.value}') for c in Ticket.Category)
+
+# Aggregate expressions for StatsView, built once. Each breakdown bucket is
+# a COUNT(...) FILTER (WHERE ...) so totals, open count, first-ticket date
+# and both breakdowns come back from a single pass over the table.
+#
+# The first-ticket date is deliberately not denormalized into a cached
+# singleton: MIN(created_at) rides along in the same scan for free, and a
+# stored value would go stale whenever the oldest ticket is deleted.
+_STATS_AGGREGATES = {
+    'total': Count('id'),
+    'open_count': Count('id', filter=Q(status=Ticket.Status.OPEN)),
+    'earliest': Min('created_at'),
+    **{alias: Count('id', filter=Q(priority=value)) for value, alias in _PRIORITY_ALIASES},
+    **{alias: Count('id', filter=Q(category=value)) for value, alias in _CATEGORY_ALIASES},
+}
+
+# Breakdown builders: itemgetter pulls every bucket's count out of the
+# aggregate row as one tuple, and dict(zip(...)) pairs it with the choice
+# values — both in C, with no Python-level loop over the buckets.
+_PRIORITY_VALUES = tuple(value for value, _ in _PRIORITY_ALIASES)
+_CATEGORY_VALUES = tuple(value for value, _ in _CATEGORY_ALIASES)
+_priority_counts = operator.itemgetter(*(alias for _, alias in _PRIORITY_ALIASES))
+_category_counts = operator.itemgetter(*(alias for _, alias in _CATEGORY_ALIASES))
+
+
+def _compute_stats() -> dict:
+    """Build the /stats/ payload (cached by StatsView)."""
+    # --- Every statistic in one aggregate query (one DB round-trip) ---
+    stats = Ticket.objects.aggregate(**_STATS_AGGREGATES)
+
+    total_tickets = stats['total']
+    open_tickets = stats['open_count']
+
+    # --- Average tickets per day ---
+    # Uses the date range from first ticket to now
+    avg_per_day = 0.0
+    if total_tickets > 0:
+        days_elapsed = (timezone.now() - stats['earliest']).total_seconds() / 86400
+        days_elapsed = max(days_elapsed, 1)  # Avoid division by zero
+        avg_per_day = round(total_tickets / days_elapsed, 1)
+
+    # --- Priority / category breakdowns (conditional counts) ---
+    priority_breakdown = dict(zip(_PRIORITY_VALUES, _priority_counts(stats)))
+    category_breakdown = dict(zip(_CATEGORY_VALUES, _category_counts(stats)))
+
+    return {
+        'total_tickets': total_tickets,
+        'open_tickets': open_tickets,
+        'avg_tickets_per_day': avg_per_day,
+        'priority_breakdown': priority_breakdown,
+        'category_breakdown': category_breakdown,
+    }
+
+
 class StatsView(APIView):
     """
     GET /api/tickets/stats/
 
     Returns aggregated ticket statistics using database-level aggregation.
-    All computation uses Django ORM aggregate/annotate — NO Python-level loops.
+    All computation is a single Django ORM aggregate() — one query, NO
+    Python-level loops over rows. The result is cached for
+    STATS_CACHE_TIMEOUT seconds under the current ticket generation, which
+    every ticket write replaces (see tickets.signals).
 
     Response format:
     {
@@ -88,57 +197,80 @@ class StatsView(APIView):
     """
 
     def get(self, request):
-        # --- Aggregate counts ---
-        counts = Ticket.objects.aggregate(
-            total=Count('id'),
-            open_count=Count('id', filter=Q(status='open')),
-        )
+        stats = get_or_set_for_generation(STATS_CACHE_KEY, _compute_stats, settings.STATS_CACHE_TIMEOUT)
+        return Response(stats)
 
-        total_tickets = counts['total']
-        open_tickets = counts['open_count']
-
-        # --- Average tickets per day ---
-        # Uses the date range from first ticket to now
-        avg_per_day = 0.0
-        if total_tickets > 0:
-            first_ticket = Ticket.objects.earliest('created_at')
-            days_elapsed = (timezone.now() - first_ticket.created_at).total_seconds() / 86400
-            days_elapsed = max(days_elapsed, 1)  # Avoid division by zero
-            avg_per_day = round(total_tickets / days_elapsed, 1)
-
-        # --- Priority breakdown (DB-level grouping) ---
-        priority_qs = (
-            Ticket.objects
-            .values('priority')
-            .annotate(count=Count('id'))
-            .order_by('priority')
-        )
-        # Initialize all priorities to 0, then fill from query
-        priority_breakdown = {p.value: 0 for p in Ticket.Priority}
-        for row in priority_qs:
-            priority_breakdown[row['priority']] = row['count']
-
-        # --- Category breakdown (DB-level grouping) ---
-        category_qs = (
-            Ticket.objects
-            .values('category')
-            .annotate(count=Count('id'))
-            .order_by('category')
+
+# The single field each classify view accepts, taken from its request
+# serializer so both share one definition (and DRF's exact validation
+# messages) without building a serializer per request.
+_DESCRIPTION_FIELD = ClassifyRequestSerializer().fields['description']
+_DESCRIPTIONS_FIELD = ClassifyBatchRequestSerializer().fields['descriptions']
+
+_FORM_CONTENT_TYPES = frozenset({'application/x-www-form-urlencoded', 'multipart/form-data'})
+
+
+def _json_response(data, status_code=200, option=None) -> HttpResponse:
+    return HttpResponse(
+        orjson.dumps(data, option=option), status=status_code, content_type='application/json',
+    )
+
+
+def _error_response(details, status_code) -> HttpResponse:
+    # Same envelope as tickets.exceptions.custom_exception_handler.
+    # Non-str keys: ListField errors are keyed by item index.
+    return _json_response(
+        {'error': get_error_title(status_code), 'details': details},
+        status_code, option=orjson.OPT_NON_STR_KEYS,
+    )
+
+
+def _parse_body(request):
+    """
+    Parse a classify request body into (data, None), or (None, error_response).
+
+    Mirrors DRF's parsers: an empty body is no data (so fields report
+    "required"), form posts are read from request.POST, JSON must be an
+    object, and any other content type is a 415.
+    """
+    if not request.body:
+        return {}, None
+    if request.content_type in _FORM_CONTENT_TYPES:
+        return request.POST, None
+    if request.content_type != 'application/json':
+        return None, _error_response(
+            {'detail': f'Unsupported media type "{request.content_type}" in request.'}, 415,
         )
-        category_breakdown = {c.value: 0 for c in Ticket.Category}
-        for row in category_qs:
-            category_breakdown[row['category']] = row['count']
+    try:
+        data = orjson.loads(request.body)
+    except orjson.JSONDecodeError as exc:
+        return None, _error_response({'detail': f'JSON parse error - {exc}'}, 400)
+    if not isinstance(data, dict):
+        return None, _error_response({'non_field_errors': ['Invalid data. Expected a dictionary.']}, 400)
+    return data, None
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class _JSONPostView(View):
+    """
+    Plain Django view base for the classify endpoints.
+
+    They validate a single field and echo a dict, so DRF's request
+    wrapping, content negotiation and serializer walk are skipped; each
+    subclass's post() parses with _parse_body(). Error responses keep the
+    API's {"error", "details"} envelope. CSRF-exempt like every APIView —
+    the API has no session authentication.
+    """
 
-        return Response({
-            'total_tickets': total_tickets,
-            'open_tickets': open_tickets,
-            'avg_tickets_per_day': avg_per_day,
-            'priority_breakdown': priority_breakdown,
-            'category_breakdown': category_breakdown,
-        })
+    http_method_names = ['post', 'options']
 
+    def http_method_not_allowed(self, request, *args, **kwargs):
+        response = _error_response({'detail': f'Method "{request.method}" not allowed.'}, 405)
+        response['Allow'] = ', '.join(m.upper() for m in self._allowed_methods())
+        return response
 
-class ClassifyView(APIView):
+
+class ClassifyView(_JSONPostView):
     """
     POST /api/tickets/classify/
 
@@ -148,16 +280,52 @@ class ClassifyView(APIView):
     Request:  {"description": "I can't log into my account..."}
     Response: {"suggested_category": "account", "suggested_priority": "high"}
 
-    On LLM failure, returns defaults with a warning field.
+    On LLM failure, returns defaults with a warning field. Answers decided
+    from unambiguous keyword signals alone carry "source": "heuristic".
     """
 
     def post(self, request):
-        serializer = ClassifyRequestSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        data, error = _parse_body(request)
+        if error is not None:
+            return error
+        try:
+            description = _DESCRIPTION_FIELD.run_validation(data.get('description', empty))
+        except ValidationError as exc:
+            return _error_response({'description': exc.detail}, 400)
+
+        logger.info('Classifying ticket description (%d chars)', len(description))
+        return _json_response(LLMService.classify(description))
+
+
+class ClassifyBatchView(_JSONPostView):
+    """
+    POST /api/tickets/classify-batch/
+
+    Classifies up to 32 descriptions in one request — for imports and
+    backfills, where one HTTP round-trip per ticket would dominate.
 
-        description = serializer.validated_data['description']
+    Request:  {"descriptions": ["Refund my double charge", "App crashes on login"]}
+    Response: {"results": [{"suggested_category": "billing", ...}, {...}]}
 
-        logger.info(f'Classifying ticket description ({len(description)} chars)')
-        result = LLMService.classify(description)
+    Results are in input order. Duplicates are classified once and the
+    Gemini calls run concurrently (LLMService.classify_batch); each result
+    has the same shape as the single classify endpoint's.
+    """
+
+    def post(self, request):
+        data, error = _parse_body(request)
+        if error is not None:
+            return error
+        # Form posts repeat the key (descriptions=a&descriptions=b); a missing
+        # key stays `empty` so it reports "required", not "may not be empty"
+        if hasattr(data, 'getlist') and 'descriptions' in data:
+            raw = data.getlist('descriptions')
+        else:
+            raw = data.get('descriptions', empty)
+        try:
+            descriptions = _DESCRIPTIONS_FIELD.run_validation(raw)
+        except ValidationError as exc:
+            return _error_response({'descriptions': exc.detail}, 400)
 
-        return Response(result, status=status.HTTP_200_OK)
+        logger.info('Classifying %d ticket descriptions', len(descriptions))
+        return _json_response({'results': LLMService.classify_batch(descriptions)})
@@ -11,11 +11,13 @@ export default function TicketCard({ ticket, onStatusChange }) {
   const categoryProps = getDisplayProps(CATEGORIES, ticket.category);
   const priorityProps = getDisplayProps(PRIORITIES, ticket.priority);
 
-  // Truncate description to 120 chars
+  // List rows carry a server-side preview; full tickets (e.g. the PATCH
+  // response swapped in after a status change) are truncated to 120 chars here
   const truncatedDesc =
-    ticket.description.length > 120
+    ticket.description_preview ??
+    (ticket.description.length > 120
       ? ticket.description.substring(0, 120) + '...'
-      : ticket.description;
+      : ticket.description);
 
   // Format timestamp as relative time
   const formatTime = (dateStr) => {